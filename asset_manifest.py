@@ -0,0 +1,50 @@
+"""
+Textures of the game by entity kind, read from assets/manifest.json:
+
+    {"pig": {"path": "img/pig_failed.png", "scale": 0.1}, ...}
+
+Paths are relative to the manifest. Each texture is loaded once, on first use, and
+shared by every sprite of that kind. preload loads the kinds a level needs up front
+and places them in a texture atlas, so the first frame and the first spawn of a kind
+do not read files or upload images.
+"""
+import json
+import os
+
+import arcade
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "manifest.json")
+
+
+class AssetManifest:
+    def __init__(self, path: str = DEFAULT_MANIFEST):
+        base = os.path.dirname(path)
+        with open(path) as f:
+            data = json.load(f)
+        self.entries = {
+            kind: (os.path.join(base, entry["path"]), entry.get("scale", 1))
+            for kind, entry in data.items()
+        }
+        self.textures = {}
+
+    def __contains__(self, kind: str) -> bool:
+        return kind in self.entries
+
+    def texture(self, kind: str) -> arcade.Texture:
+        texture = self.textures.get(kind)
+        if texture is None:
+            texture = arcade.load_texture(self.entries[kind][0])
+            self.textures[kind] = texture
+        return texture
+
+    def scale(self, kind: str) -> float:
+        return self.entries[kind][1]
+
+    def preload(self, kinds, atlas: arcade.TextureAtlas = None):
+        """
+        Load the textures of `kinds` now and add them to `atlas` if given.
+        """
+        for kind in kinds:
+            texture = self.texture(kind)
+            if atlas is not None and not atlas.has_texture(texture):
+                atlas.add(texture)
@@ -0,0 +1,72 @@
+"""
+Per-step cost of resolving collision arbiters to game objects, linear scan over
+the world (the old App.collision_handler) versus the EntityStore lookup.
+
+Run from the repository root:
+
+    python benchmarks/bench_collision_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymunk
+
+from game_object import LevelManager
+
+SIZES = [10, 50, 100, 200, 400]
+STEPS = 120
+
+
+def build_level(count):
+    space = pymunk.Space()
+    space.gravity = (0, -900)
+    floor = pymunk.Segment(space.static_body, (0, 15), (100000, 15), 0.0)
+    floor.friction = 10
+    space.add(floor)
+    world = []
+    level_manager = LevelManager(space)
+    columns = [(100 + 30 * i, 60) for i in range(count // 2)]
+    pigs = [(100 + 30 * i, 130) for i in range(count - count // 2)]
+    level_manager.add_objects(columns, pigs, world)
+    return space, world, level_manager.entities
+
+
+def run(count, resolver):
+    space, world, entities = build_level(count)
+    resolved = [0]
+
+    def scan(arbiter, space, data):
+        for obj in world:
+            if obj.shape in arbiter.shapes:
+                resolved[0] += 1
+        return True
+
+    def indexed(arbiter, space, data):
+        for shape in arbiter.shapes:
+            if entities.lookup(shape) is not None:
+                resolved[0] += 1
+        return True
+
+    handler = space.add_default_collision_handler()
+    handler.post_solve = scan if resolver == "scan" else indexed
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        space.step(1 / 60.0)
+    elapsed = time.perf_counter() - start
+    return elapsed / STEPS * 1000, resolved[0]
+
+
+def main():
+    print(f"{'objects':>8} {'scan ms/step':>14} {'index ms/step':>14} {'speedup':>8}")
+    for count in SIZES:
+        scan_ms, scan_hits = run(count, "scan")
+        index_ms, index_hits = run(count, "index")
+        assert scan_hits == index_hits, (scan_hits, index_hits)
+        print(f"{count:>8} {scan_ms:>14.3f} {index_ms:>14.3f} {scan_ms / index_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
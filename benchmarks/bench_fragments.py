@@ -0,0 +1,49 @@
+"""
+Explodes and splits birds many times in one level and checks that the number of
+bodies in the space stays bounded, i.e. fragments are recycled instead of leaked.
+Exits with status 1 if the space keeps growing.
+
+    python benchmarks/bench_fragments.py
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic import ImpulseVector
+from game_object import BlueBird, ExplosiveBird
+from simulation import Simulation
+
+ROUNDS = 500
+
+
+def main():
+    simulation = Simulation()
+    # sin límite de pájaros, se lanza hasta agotar las rondas
+    simulation.check_level_state = lambda: None
+    world_size = len(simulation.world)
+    counts = []
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        bird_type = ExplosiveBird if i % 2 else BlueBird
+        bird = simulation.launch(bird_type, ImpulseVector(math.pi + 0.6, -60))
+        simulation.step(10)
+        simulation.activate_bird()
+        simulation.step(5)
+        # el pájaro lanzado se quita a mano, solo se miden los fragmentos
+        simulation.remove(bird)
+        counts.append(len(simulation.space.bodies))
+    elapsed = time.perf_counter() - start
+
+    print(f"{ROUNDS} rondas en {elapsed:.2f}s, cuerpos: min {min(counts)} max {max(counts)} final {counts[-1]}")
+    # piso, pared, objetos del nivel y como mucho un pool lleno de fragmentos
+    limit = 2 + world_size + simulation.fragment_pool.size
+    if max(counts) > limit:
+        print("el número de cuerpos sigue creciendo")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
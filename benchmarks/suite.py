@@ -0,0 +1,166 @@
+"""
+Headless benchmark suite for the physics loop and the game objects. Measures steps
+per second and per-step latency for levels of growing size built through
+LevelManager.add_objects, for every bird type through its special action, and for the
+procedural layouts of level_generator.py under each broadphase and with pymunk's
+threaded solver, with and without an explosion in the middle of the scene.
+
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.15
+
+With --compare the exit status is 1 when a case got slower than the threshold.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic import ImpulseVector
+from game_object import BIRD_TYPES
+from level_generator import LAYOUTS, generate_level
+from level_pack import LevelPack
+from simulation import Simulation, WIDTH
+
+SIZES = [10, 100, 1000, 5000]
+STEPS = 120
+REPEAT = 3
+BIRD_LEVEL_SIZE = 100
+ACTIVATE_AT = 10
+GENERATED_SIZE = 1000
+THREADS = 2
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def build_simulation(count: int) -> Simulation:
+    """
+    A level with `count` columns and pigs, alternating, packed in rows over the floor.
+    """
+    # la escena quieta dejaría de simularse, aquí se mide cada paso de la física
+    simulation = Simulation(skip_idle=False)
+    simulation.remove_many(list(simulation.world))
+    per_row = int((WIDTH - 400) // 30)
+    columns_data = []
+    pigs_data = []
+    for i in range(count):
+        x = 400 + (i % per_row) * 30
+        row = i // per_row
+        if i % 2:
+            pigs_data.append((x, 40 + row * 100))
+        else:
+            columns_data.append((x, 60 + row * 100))
+    simulation.level_manager.add_objects(columns_data, pigs_data, simulation.world)
+    simulation.remaining_pigs = len(pigs_data)
+    return simulation
+
+
+def build_generated(layout: str, count: int, broadphase: str = "bbtree", threads: int = 1) -> Simulation:
+    pack = LevelPack()
+    pack.append(generate_level(layout, count))
+    return Simulation(level=len(pack) - 1, pack=pack, broadphase=broadphase, threads=threads, skip_idle=False)
+
+
+def measure(simulation: Simulation, steps: int, activate_at: int = None) -> dict:
+    latencies = []
+    for i in range(steps):
+        if i == activate_at:
+            simulation.activate_bird()
+        start = time.perf_counter()
+        simulation.step()
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+    return {
+        "steps_per_sec": steps / total,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def best_of(repeat: int, case) -> dict:
+    """
+    Run a case several times from scratch and keep the fastest run, to damp noise.
+    """
+    return max((case() for _ in range(repeat)), key=lambda result: result["steps_per_sec"])
+
+
+def run(sizes, steps, repeat) -> dict:
+    # calentamiento, la primera simulación del proceso siempre es más lenta
+    measure(build_simulation(BIRD_LEVEL_SIZE), steps)
+    results = {}
+    for size in sizes:
+        results[f"physics/{size}"] = best_of(repeat, lambda: measure(build_simulation(size), steps))
+    for name, bird_type in BIRD_TYPES.items():
+        def case():
+            simulation = build_simulation(BIRD_LEVEL_SIZE)
+            simulation.launch(bird_type, ImpulseVector(math.pi + 0.5, -80))
+            return measure(simulation, steps, ACTIVATE_AT)
+        results[f"bird/{name}"] = best_of(repeat, case)
+    for layout in LAYOUTS:
+        for broadphase in ("bbtree", "hash"):
+            results[f"{layout}/{broadphase}"] = best_of(
+                repeat, lambda: measure(build_generated(layout, GENERATED_SIZE, broadphase), steps))
+        results[f"{layout}/threads{THREADS}"] = best_of(
+            repeat, lambda: measure(build_generated(layout, GENERATED_SIZE, threads=THREADS), steps))
+    for threads in (1, THREADS):
+        def case():
+            simulation = build_generated("tower", GENERATED_SIZE, threads=threads)
+            # el pájaro explota dentro de las torres
+            simulation.launch(BIRD_TYPES["explosive"], ImpulseVector(0, 0), 1000, 300)
+            return measure(simulation, steps, ACTIVATE_AT)
+        results[f"explosion/threads{threads}"] = best_of(repeat, case)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for case, result in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        change = result["steps_per_sec"] / reference["steps_per_sec"] - 1
+        flag = "REGRESIÓN" if change < -threshold else ""
+        print(f"{case:>16} {reference['steps_per_sec']:10.1f} -> {result['steps_per_sec']:10.1f} "
+              f"steps/s ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(case)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--steps", type=int, default=STEPS)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--save", metavar="PATH", help="guardar los resultados como línea base")
+    parser.add_argument("--compare", metavar="PATH", help="comparar contra una línea base")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="caída relativa de steps/s que se considera regresión")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.steps, args.repeat)
+    for case, result in results.items():
+        print(f"{case:>16} {result['steps_per_sec']:10.1f} steps/s  "
+              f"p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "steps": args.steps, "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import inspect
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from game_logic import get_impulse_vector, predict_trajectory, Point2D
+from game_object import Bird, BIRD_TYPES
+from simulation import WIDTH
+
+logger = logging.getLogger(__name__)
+
+# pasos de física que cubre la trayectoria y cada cuántos se dibuja un punto
+PREVIEW_STEPS = 120
+PREVIEW_STRIDE = 3
+# píxeles por celda al cuantizar el arrastre
+PREVIEW_GRID = 2
+PREVIEW_FLOOR = 15
+
+
+class TrajectoryPreview:
+    """
+    Predicted flight of the bird being aimed, evaluated in closed form from the same
+    impulse the launch will apply. Predictions are cached per drag point quantized to a
+    PREVIEW_GRID pixel grid, so a pointer that barely moves costs a dictionary lookup.
+    The simulation integrates each step in `substeps` smaller ones, so does the preview.
+    """
+    def __init__(self, time_step: float, gravity: float, width: float, substeps: int = 1, cache_size: int = 512):
+        self.time_step = time_step / substeps
+        self.gravity = gravity
+        self.width = width
+        # los puntos siguen en pasos del juego, contados en sub-pasos del integrador
+        self.steps = np.arange(PREVIEW_STRIDE, PREVIEW_STEPS + 1, PREVIEW_STRIDE) * substeps
+        self.predict = lru_cache(maxsize=cache_size)(self.predict_cell)
+
+    @staticmethod
+    def launch_params(bird_type) -> dict:
+        parameters = inspect.signature(bird_type).parameters
+        return {name: parameters[name].default for name in ("mass", "max_impulse", "power_multiplier")}
+
+    def points(self, bird_type, start_point: Point2D, end_point: Point2D) -> np.ndarray:
+        return self.predict(
+            bird_type,
+            round(start_point.x / PREVIEW_GRID), round(start_point.y / PREVIEW_GRID),
+            round(end_point.x / PREVIEW_GRID), round(end_point.y / PREVIEW_GRID),
+        )
+
+    def predict_cell(self, bird_type, start_x: int, start_y: int, end_x: int, end_y: int) -> np.ndarray:
+        start_point = Point2D(start_x * PREVIEW_GRID, start_y * PREVIEW_GRID)
+        end_point = Point2D(end_x * PREVIEW_GRID, end_y * PREVIEW_GRID)
+        # el pájaro sale desde donde se suelta el mouse
+        points = predict_trajectory(
+            get_impulse_vector(start_point, end_point), end_point.x, end_point.y,
+            self.steps, self.time_step, self.gravity, **self.launch_params(bird_type),
+        )
+        outside = (points[:, 1] < PREVIEW_FLOOR) | (points[:, 0] < 0) | (points[:, 0] > self.width)
+        if outside.any():
+            points = points[:outside.argmax()]
+        return points
+
+
+class Controller:
+    """
+    Turns pointer and key input into simulation actions: aiming, launching, the special
+    action of the bird in flight and the choice of bird. It has no window, so a replay
+    can feed it the same events App received.
+    """
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.start_point = Point2D()
+        self.end_point = Point2D()
+        self.draw_line = False
+        # que cambie de tipo de pájaro, aquí se guarda
+        self.bird_type = Bird
+        self.recorder = None
+        self.preview = TrajectoryPreview(simulation.time_step, simulation.space.gravity.y, WIDTH,
+                                         simulation.substeps)
+
+    def press(self, x: float, y: float):
+        if self.recorder:
+            self.recorder.record("press", x, y)
+        # para que se pueda hacer click dos veces y no se dibuje, sino se aumente la velocidad del pajaro amarillo o se divida el pajáro azul
+        if self.simulation.bird_flying:
+            self.simulation.activate_bird()
+        else:
+            self.start_point = Point2D(x, y)
+            self.end_point = Point2D(x, y)
+            self.draw_line = True
+            logger.debug(f"Start Point: {self.start_point}")
+
+    def drag(self, x: float, y: float):
+        if self.recorder:
+            self.recorder.record("drag", x, y)
+        self.end_point = Point2D(x, y)
+        logger.debug(f"Dragging to: {self.end_point}")
+
+    def release(self, x: float, y: float):
+        if self.recorder:
+            self.recorder.record("release", x, y)
+        if self.simulation.bird_flying:
+            logger.debug("¡No puedes lanzar más pájaros!")
+            return
+        logger.debug(f"Releasing from: {self.end_point}")
+        self.draw_line = False
+        impulse_vector = get_impulse_vector(self.start_point, self.end_point)
+        self.simulation.launch(self.bird_type, impulse_vector, x, y)
+
+    def select_bird(self, name: str):
+        if self.recorder:
+            self.recorder.record("select_bird", name)
+        self.bird_type = BIRD_TYPES[name]
+
+    def trajectory(self) -> np.ndarray:
+        """
+        Predicted path of the bird that would be launched now, empty when not aiming.
+        """
+        if not self.draw_line:
+            return np.empty((0, 2))
+        return self.preview.points(self.bird_type, self.start_point, self.end_point)
@@ -0,0 +1,202 @@
+"""
+Gym-style environments for training agents on the game rules, without a window.
+
+One environment step is one shot: the action is (angle, impulse, bird) with the angle
+in radians, the impulse in ImpulseVector units and bird an index into BIRD_TYPES, and
+the physics runs until everything is at rest. The observation holds one row per level
+object, (x, y, angle, kind) with kind 1 for pigs, 2 for columns and 0 once destroyed,
+and the reward is the score the shot made.
+
+    env = AngryBirdsEnv(level=1)
+    observation, info = env.reset()
+    observation, reward, terminated, truncated, info = env.step((0.6, 60, 0))
+
+VectorEnv steps N of them per call on a thread or process pool, returns stacked
+arrays and resets finished environments by reloading the level.
+"""
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from game_logic import ImpulseVector
+from game_object import BIRD_TYPES, EntityStore
+from level_pack import LevelPack
+from shot_solver import MAX_STEPS, is_settled
+from simulation import Simulation
+
+ACTIONS = list(BIRD_TYPES.values())
+KIND_PIG = EntityStore.PIG
+KIND_COLUMN = EntityStore.COLUMN
+
+
+class AngryBirdsEnv:
+    def __init__(self, level: int = 0, activate_at: int = None, max_steps: int = MAX_STEPS, pack=None):
+        self.level = level
+        self.activate_at = activate_at
+        self.max_steps = max_steps
+        # la simulación solo ve el nivel del entorno: al completarlo termina el episodio
+        # en vez de pasar al nivel siguiente
+        pack = pack if pack is not None else LevelPack()
+        self.simulation = Simulation(0, pack=[pack[level]])
+        self.simulation.destruction_listeners.append(self.on_destroy)
+        self.simulation.on_level_end = self.on_level_end
+        self.reward = 0
+        self.level_ended = False
+        self.final_observation = None
+        self.final_info = None
+        self.objects = list(self.simulation.world)
+        self.observation_shape = (len(self.objects), 4)
+
+    def on_destroy(self, obj, points):
+        self.reward += points
+
+    def on_level_end(self):
+        # la simulación recarga el nivel enseguida, se guarda cómo terminó
+        self.level_ended = True
+        self.final_observation = self.observe()
+        self.final_info = self.info()
+
+    def observe(self) -> np.ndarray:
+        observation = np.zeros(self.observation_shape, dtype=np.float32)
+        entities = self.simulation.entities
+        for i, obj in enumerate(self.objects):
+            entity = entities.entity(obj.shape)
+            if entity is not None:
+                body = obj.body
+                observation[i] = (*body.position, body.angle, entities.kind[entity])
+        return observation
+
+    def info(self) -> dict:
+        simulation = self.simulation
+        return {
+            "remaining_pigs": simulation.remaining_pigs,
+            "birds_used": simulation.bird_count,
+            "score": simulation.score,
+        }
+
+    def reset(self, seed: int = None):
+        """
+        Reload the level from its snapshot. The game has no randomness, `seed` is only
+        accepted for compatibility.
+        """
+        simulation = self.simulation
+        simulation.game_over = False
+        simulation.is_win = False
+        simulation.setup_level()
+        self.objects = list(simulation.world)
+        self.level_ended = False
+        self.final_observation = None
+        self.final_info = None
+        return self.observe(), self.info()
+
+    def step(self, action):
+        angle, impulse, bird = action
+        simulation = self.simulation
+        self.reward = 0
+        simulation.launch(ACTIONS[int(bird)], ImpulseVector(float(angle), float(impulse)))
+        steps = 0
+        while steps < self.max_steps and not self.level_ended:
+            simulation.step()
+            steps += 1
+            if steps == self.activate_at:
+                simulation.activate_bird()
+            if steps > 1 and is_settled(simulation):
+                break
+        if self.level_ended:
+            observation, info = self.final_observation, self.final_info
+            terminated = True
+        else:
+            observation, info = self.observe(), self.info()
+            terminated = simulation.remaining_pigs == 0
+        # un tiro que no se detuvo a tiempo deja el episodio truncado
+        truncated = not terminated and simulation.bird_flying
+        return observation, self.reward, terminated, truncated, info
+
+
+def step_and_reset(env: AngryBirdsEnv, action):
+    observation, reward, terminated, truncated, info = env.step(action)
+    if terminated or truncated:
+        info["final_observation"] = observation
+        observation, _ = env.reset()
+    return observation, reward, terminated, truncated, info
+
+
+def _worker(connection, count, kwargs):
+    # cada proceso tiene sus propios entornos y espacios de pymunk
+    envs = [AngryBirdsEnv(**kwargs) for _ in range(count)]
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            connection.send([env.reset() for env in envs])
+        elif command == "step":
+            connection.send([step_and_reset(env, action) for env, action in zip(envs, data)])
+        else:
+            connection.close()
+            return
+
+
+class VectorEnv:
+    """
+    N independent environments stepped together. With backend "thread" every step
+    runs on a thread pool, pymunk releases the GIL inside the solver. With "process"
+    the environments are split among worker processes that keep them between calls.
+    """
+    def __init__(self, num_envs: int, backend: str = "thread", processes: int = None, **kwargs):
+        if backend not in ("thread", "process"):
+            raise ValueError(f"unknown backend {backend!r}, expected 'thread' or 'process'")
+        self.num_envs = num_envs
+        self.backend = backend
+        if backend == "thread":
+            self.envs = [AngryBirdsEnv(**kwargs) for _ in range(num_envs)]
+            self.pool = ThreadPoolExecutor(processes or num_envs)
+        else:
+            processes = min(processes or multiprocessing.cpu_count(), num_envs)
+            counts = [num_envs // processes + (i < num_envs % processes) for i in range(processes)]
+            self.counts = counts
+            self.connections = []
+            self.workers = []
+            for count in counts:
+                parent, child = multiprocessing.Pipe()
+                worker = multiprocessing.Process(target=_worker, args=(child, count, kwargs), daemon=True)
+                worker.start()
+                child.close()
+                self.connections.append(parent)
+                self.workers.append(worker)
+
+    def _scatter(self, command, data=None) -> list:
+        if self.backend == "thread":
+            if command == "reset":
+                return list(self.pool.map(lambda env: env.reset(), self.envs))
+            return list(self.pool.map(step_and_reset, self.envs, data))
+        start = 0
+        for connection, count in zip(self.connections, self.counts):
+            connection.send((command, None if data is None else data[start:start + count]))
+            start += count
+        results = []
+        for connection in self.connections:
+            results.extend(connection.recv())
+        return results
+
+    def reset(self, seed: int = None):
+        observations, infos = zip(*self._scatter("reset"))
+        return np.stack(observations), list(infos)
+
+    def step(self, actions):
+        """
+        `actions` has shape (num_envs, 3). Finished environments are reset, their last
+        observation is in info["final_observation"].
+        """
+        actions = np.asarray(actions, dtype=float)
+        observations, rewards, terminated, truncated, infos = zip(*self._scatter("step", list(actions)))
+        return (np.stack(observations), np.array(rewards, dtype=np.float32),
+                np.array(terminated), np.array(truncated), list(infos))
+
+    def close(self):
+        if self.backend == "thread":
+            self.pool.shutdown()
+            return
+        for connection in self.connections:
+            connection.send(("close", None))
+        for worker in self.workers:
+            worker.join()
@@ -1,17 +1,35 @@
 import math
-import arcade
-import arcade.key
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pymunk
 from game_logic import ImpulseVector
+from level_pack import Level, LevelPack, MATERIALS
+
+# Medidas de las texturas originales, la física no depende de cargarlas
+PIG_RADIUS = 38.8 / 2 - 3  # pig_failed.png escalado a 0.1
+COLUMN_SIZE = (25, 90)  # column.png
+
+# tipos de colisión de pymunk, uno por categoría
+COLLISION_BIRD = 1
+COLLISION_PIG = 2
+COLLISION_STRUCTURE = 3
+COLLISION_STATIC = 4
+# los fragmentos comparten grupo, así no chocan entre ellos
+FRAGMENT_FILTER = pymunk.ShapeFilter(group=1)
+
+# un solo hilo para construir niveles por adelantado, compartido por todas las simulaciones
+PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
 
-class Bird(arcade.Sprite):
+
+class Bird:
     """
     Bird class. This represents an angry bird. All the physics is handled by Pymunk,
     the init method only set some initial properties
     """
     def __init__(
         self,
-        image_path: str,
         impulse_vector: ImpulseVector,
         x: float,
         y: float,
@@ -22,9 +40,8 @@ class Bird(arcade.Sprite):
         power_multiplier: float = 50,
         elasticity: float = 0.8,
         friction: float = 1,
-        collision_layer: int = 0,
+        collision_layer: int = COLLISION_BIRD,
     ):
-        super().__init__(image_path, 1)
         # body
         moment = pymunk.moment_for_circle(mass, 0, radius)
         body = pymunk.Body(mass, moment)
@@ -44,17 +61,27 @@ class Bird(arcade.Sprite):
 
         self.body = body
         self.shape = shape
+        self.is_fragment = False
+
+    def activate(self, simulation):
+        """
+        Special action triggered by a click while the bird is flying. The red bird has none.
+        """
 
-    def update(self):
+    def spawn_fragments(self, simulation, angles):
         """
-        Update the position of the bird sprite based on the physics body position
+        Spawn one fragment of this bird's class per angle (degrees) relative to the current
+        direction, all with the current speed. Fragments come from the simulation's pool.
         """
-        self.center_x = self.shape.body.position.x
-        self.center_y = self.shape.body.position.y
-        self.radians = self.shape.body.angle
+        for angle in angles:
+            new_angle = self.body.velocity.angle + math.radians(angle)
+            new_velocity_vector = pymunk.Vec2d(self.body.velocity.length, 0).rotated(new_angle)
+            simulation.spawn_fragment(type(self), self.body.position, new_velocity_vector)
 
 
-class Pig(arcade.Sprite):
+class Pig:
+    __slots__ = ("body", "shape")
+
     def __init__(
         self,
         x: float,
@@ -63,48 +90,42 @@ class Pig(arcade.Sprite):
         mass: float = 2,
         elasticity: float = 0.8,
         friction: float = 0.4,
-        collision_layer: int = 0,
+        collision_layer: int = COLLISION_PIG,
+        radius: float = PIG_RADIUS,
     ):
-        super().__init__("assets/img/pig_failed.png", 0.1)
-        moment = pymunk.moment_for_circle(mass, 0, self.width / 2 - 3)
+        moment = pymunk.moment_for_circle(mass, 0, radius)
         body = pymunk.Body(mass, moment)
         body.position = (x, y)
-        shape = pymunk.Circle(body, self.width / 2 - 3)
+        shape = pymunk.Circle(body, radius)
         shape.elasticity = elasticity
         shape.friction = friction
         shape.collision_type = collision_layer
         space.add(body, shape)
         self.body = body
         self.shape = shape
-        self.is_destroyed = False
-
-    def update(self):
-        self.center_x = self.shape.body.position.x
-        self.center_y = self.shape.body.position.y
-        self.radians = self.shape.body.angle
 
 
-class PassiveObject(arcade.Sprite):
+class PassiveObject:
     """
     Passive object that can interact with other objects.
     """
+    __slots__ = ("body", "shape")
+
     def __init__(
         self,
-        image_path: str,
+        size: tuple,
         x: float,
         y: float,
         space: pymunk.Space,
         mass: float = 2,
         elasticity: float = 0.8,
         friction: float = 1,
-        collision_layer: int = 0,
+        collision_layer: int = COLLISION_STRUCTURE,
     ):
-        super().__init__(image_path, 1)
-
-        moment = pymunk.moment_for_box(mass, (self.width, self.height))
+        moment = pymunk.moment_for_box(mass, size)
         body = pymunk.Body(mass, moment)
         body.position = (x, y)
-        shape = pymunk.Poly.create_box(body, (self.width, self.height))
+        shape = pymunk.Poly.create_box(body, size)
         shape.elasticity = elasticity
         shape.friction = friction
         shape.collision_type = collision_layer
@@ -112,202 +133,167 @@ class PassiveObject(arcade.Sprite):
         self.body = body
         self.shape = shape
 
-    def update(self):
-        self.center_x = self.shape.body.position.x
-        self.center_y = self.shape.body.position.y
-        self.radians = self.shape.body.angle
-
 
 class Column(PassiveObject):
-    def __init__(self, x, y, space):
-        super().__init__("assets/img/column.png", x, y, space)
+    __slots__ = ()
 
+    def __init__(self, x, y, space, mass=2, elasticity=0.8, friction=1):
+        super().__init__(COLUMN_SIZE, x, y, space, mass, elasticity, friction)
+
+
+class StaticObject:
+    """
+    Fixed segment of the scene, the floor and the walls.
+    """
+    __slots__ = ("body", "shape")
 
-class StaticObject(arcade.Sprite):
     def __init__(
-            self,
-            image_path: str,
-            x: float,
-            y: float,
-            space: pymunk.Space,
-            mass: float = 2,
-            elasticity: float = 0.8,
-            friction: float = 1,
-            collision_layer: int = 0,
+        self,
+        a: tuple,
+        b: tuple,
+        space: pymunk.Space,
+        friction: float = 10,
+        collision_layer: int = COLLISION_STATIC,
     ):
-        super().__init__(image_path, 1)
+        body = pymunk.Body(body_type=pymunk.Body.STATIC)
+        shape = pymunk.Segment(body, a, b, 0.0)
+        shape.friction = friction
+        shape.collision_type = collision_layer
+        space.add(body, shape)
+        self.body = body
+        self.shape = shape
+
 
 class YellowBird(Bird):
     def __init__(
-        self, 
-        image_path: str, 
-        impulse_vector: ImpulseVector, 
-        x: float, 
-        y: float, 
-        space: pymunk.Space, 
-        mass: float = 5, 
-        radius: float = 12, 
-        max_impulse: float = 100, 
+        self,
+        impulse_vector: ImpulseVector,
+        x: float,
+        y: float,
+        space: pymunk.Space,
+        mass: float = 5,
+        radius: float = 12,
+        max_impulse: float = 100,
         power_multiplier: float = 50,
-        elasticity: float = 0.8, 
-        friction: float = 1, 
-        collision_layer: int = 0, 
+        elasticity: float = 0.8,
+        friction: float = 1,
+        collision_layer: int = COLLISION_BIRD,
         boost_multiplier: float = 2
     ):
-        super().__init__(image_path, impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
+        super().__init__(impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
         self.initial_impulse = impulse_vector
         self.boost_multiplier = boost_multiplier
         self.has_boosted = False
 
-
     def boost(self):
         if not self.has_boosted:
             impulse_vector = pymunk.Vec2d(1, 0).rotated(self.body.angle) * self.boost_multiplier * self.body.mass * 500
             self.body.apply_impulse_at_local_point(impulse_vector)
             self.has_boosted = True
-       
+
+    def activate(self, simulation):
+        self.boost()
+
+
 class BlueBird(Bird):
     def __init__(
-        self, 
-        image_path: str, 
-        impulse_vector: ImpulseVector, 
-        x: float, 
-        y: float, 
-        space: pymunk.Space, 
-        mass: float = 5, 
-        radius: float = 12, 
-        max_impulse: float = 100, 
+        self,
+        impulse_vector: ImpulseVector,
+        x: float,
+        y: float,
+        space: pymunk.Space,
+        mass: float = 5,
+        radius: float = 12,
+        max_impulse: float = 100,
         power_multiplier: float = 50,
-        elasticity: float = 0.8, 
-        friction: float = 1, 
-        collision_layer: int = 0
+        elasticity: float = 0.8,
+        friction: float = 1,
+        collision_layer: int = COLLISION_BIRD
     ):
-        super().__init__(image_path, impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
+        super().__init__(impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
         self.has_split = False
-        self.space = space
 
-    def split(self, app):
+    def split(self, simulation):
         if not self.has_split:
-            angles = [-30, 30]
-
-            for angle in angles:
-                new_angle = self.body.velocity.angle + math.radians(angle)
-                new_velocity_vector = pymunk.Vec2d(self.body.velocity.length, 0).rotated(new_angle)
-
-                new_body = pymunk.Body(self.body.mass, self.body.moment)
-                new_body.position = self.body.position 
-                new_body.velocity = new_velocity_vector  
-
-                new_shape = pymunk.Circle(new_body, self.shape.radius)
-                new_shape.elasticity = self.shape.elasticity
-                new_shape.friction = self.shape.friction
-
-                new_bird = BlueBird(
-                    self.texture.name,
-                    ImpulseVector(new_velocity_vector.angle, new_velocity_vector.length),
-                    new_body.position.x,
-                    new_body.position.y,
-                    self.space
-                )
-                new_bird.body = new_body 
-                new_bird.shape = new_shape 
-                self.space.add(new_bird.body, new_bird.shape)
-                app.sprites.append(new_bird)  
-                app.birds.append(new_bird)  
-
-        self.has_split = True  
+            self.spawn_fragments(simulation, [-30, 30])
+
+        self.has_split = True
+
+    def activate(self, simulation):
+        self.split(simulation)
+
 
 class ExplosiveBird(Bird):
     def __init__(
-        self, 
-        image_path: str, 
-        impulse_vector: ImpulseVector, 
-        x: float, 
-        y: float, 
-        space: pymunk.Space, 
-        mass: float = 5, 
-        radius: float = 12, 
-        max_impulse: float = 100, 
+        self,
+        impulse_vector: ImpulseVector,
+        x: float,
+        y: float,
+        space: pymunk.Space,
+        mass: float = 5,
+        radius: float = 12,
+        max_impulse: float = 100,
         power_multiplier: float = 50,
-        elasticity: float = 0.8, 
-        friction: float = 1, 
-        collision_layer: int = 0
+        elasticity: float = 0.8,
+        friction: float = 1,
+        collision_layer: int = COLLISION_BIRD
     ):
-        super().__init__(image_path, impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
-        self.has_exploded = False  
-        self.space = space
+        super().__init__(impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
+        self.has_exploded = False
 
-    def explode(self, app):
+    def explode(self, simulation):
         if not self.has_exploded:
             self.has_exploded = True
-            angles =[-90, -60, -30, 30, 60, 90,180]
-            for angle in angles:  
-                new_angle = self.body.velocity.angle + math.radians(angle)
-                new_velocity_vector = pymunk.Vec2d(self.body.velocity.length, 0).rotated(new_angle)
-
-                new_body = pymunk.Body(self.body.mass, self.body.moment)
-                new_body.position = self.body.position 
-                new_body.velocity = new_velocity_vector  
-
-                new_shape = pymunk.Circle(new_body, self.shape.radius)
-                new_shape.elasticity = self.shape.elasticity
-                new_shape.friction = self.shape.friction
-
-                new_bird = ExplosiveBird(
-                    self.texture.name,
-                    ImpulseVector(new_velocity_vector.angle, new_velocity_vector.length),
-                    new_body.position.x,
-                    new_body.position.y,
-                    self.space
-                )
-                new_bird.body = new_body 
-                new_bird.shape = new_shape 
-                self.space.add(new_bird.body, new_bird.shape)
-                app.sprites.append(new_bird)  
-                app.birds.append(new_bird)  
+            self.spawn_fragments(simulation, [-90, -60, -30, 30, 60, 90, 180])
 
         self.has_exploded = True
 
+    def activate(self, simulation):
+        self.explode(simulation)
+
+
 class GrowingBird(Bird):
     def __init__(
-        self, 
-        image_path: str, 
-        impulse_vector: ImpulseVector, 
-        x: float, 
-        y: float, 
-        space: pymunk.Space, 
-        mass: float = 5, 
-        radius: float = 12, 
-        max_impulse: float = 100, 
+        self,
+        impulse_vector: ImpulseVector,
+        x: float,
+        y: float,
+        space: pymunk.Space,
+        mass: float = 5,
+        radius: float = 12,
+        max_impulse: float = 100,
         power_multiplier: float = 50,
-        elasticity: float = 0.8, 
-        friction: float = 1, 
-        collision_layer: int = 0
+        elasticity: float = 0.8,
+        friction: float = 1,
+        collision_layer: int = COLLISION_BIRD
     ):
-        super().__init__(image_path, impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
-        
+        super().__init__(impulse_vector, x, y, space, mass, radius, max_impulse, power_multiplier, elasticity, friction, collision_layer)
+
         self.space = space
         self.radius = radius
         self.mass = mass
         self.elasticity = elasticity
         self.friction = friction
-        
-        self.has_growth = False  
+        self.scale = 1
+
+        self.has_growth = False
 
     def growth(self):
         if not self.has_growth:
-            self.radius *= 1.5 
-            self.mass *= 2    
+            self.radius *= 1.5
+            self.mass *= 2
             self.has_growth = True
-            
-            self.space.remove(self.body, self.shape)  
-            
+
+            self.space.remove(self.body, self.shape)
+
             body = pymunk.Body(self.mass, pymunk.moment_for_circle(self.mass, 0, self.radius))
             body.position = self.body.position
             body.velocity = self.body.velocity
             shape = pymunk.Circle(body, self.radius)
             shape.elasticity = self.elasticity
             shape.friction = self.friction
+            shape.collision_type = self.shape.collision_type
+            shape.filter = self.shape.filter
 
             self.space.add(body, shape)
 
@@ -315,25 +301,218 @@ class GrowingBird(Bird):
             self.shape = shape
 
             self.scale = self.radius / 12
-            
-            
+
+    def activate(self, simulation):
+        # growth() reemplaza la shape, hay que reindexarla
+        simulation.entities.remove(self)
+        self.growth()
+        simulation.entities.add(self)
+
+
+def renew_body(obj):
+    """
+    Give an object that is out of any space a new body and shape equal to the old
+    ones. pymunk keeps solver state in a body that cannot be reset from Python (the
+    bias velocities of the last step), a new body starts as clean as a built one.
+    """
+    old_body, old_shape = obj.body, obj.shape
+    body = pymunk.Body(old_body.mass, old_body.moment)
+    if isinstance(old_shape, pymunk.Circle):
+        shape = pymunk.Circle(body, old_shape.radius, old_shape.offset)
+    else:
+        vertices = old_shape.get_vertices()
+        shape = pymunk.Poly(body, vertices, radius=old_shape.radius)
+        # Poly reordena los vértices al calcular el casco convexo, el orden cambia la física
+        shape.unsafe_set_vertices(vertices)
+    shape.elasticity = old_shape.elasticity
+    shape.friction = old_shape.friction
+    shape.collision_type = old_shape.collision_type
+    shape.filter = old_shape.filter
+    obj.body = body
+    obj.shape = shape
+
+
+class FragmentPool:
+    """
+    Reusable birds for BlueBird.split and ExplosiveBird.explode. Fragments are built once
+    through the normal Bird constructor and parked outside the space when removed, so a
+    split only resets a body instead of building a new one. At most `size` fragments are
+    live at once, the simulation recycles the oldest one when the pool is full.
+    """
+    def __init__(self, space: pymunk.Space, size: int = 21):
+        self.space = space
+        self.size = size
+        self.parked = {}
+        self.live = deque()
+
+    def prefill(self, bird_type, count: int):
+        # se construyen aparte, agregarlos y quitarlos del espacio real cambiaría el
+        # orden interno de sus formas
+        scratch = pymunk.Space()
+        parked = self.parked.setdefault(bird_type, [])
+        for _ in range(count):
+            bird = bird_type(ImpulseVector(0, 0), 0, 0, scratch)
+            bird.is_fragment = True
+            bird.shape.filter = FRAGMENT_FILTER
+            scratch.remove(bird.body, bird.shape)
+            parked.append(bird)
+
+    def is_full(self) -> bool:
+        return len(self.live) >= self.size
+
+    def acquire(self, bird_type, position, velocity) -> Bird:
+        parked = self.parked.setdefault(bird_type, [])
+        if not parked:
+            self.prefill(bird_type, 1)
+        bird = parked.pop()
+        body = bird.body
+        body.position = position
+        body.velocity = velocity
+        body.angle = 0
+        body.angular_velocity = 0
+        body.force = (0, 0)
+        body.torque = 0
+        self.space.add(body, bird.shape)
+        self.live.append(bird)
+        return bird
+
+    def release(self, bird: Bird):
+        """
+        Park a fragment that has already been taken out of the space.
+        """
+        self.live.remove(bird)
+        renew_body(bird)
+        self.parked[type(bird)].append(bird)
+
+    def release_all(self):
+        while self.live:
+            bird = self.live.popleft()
+            renew_body(bird)
+            self.parked[type(bird)].append(bird)
+
+
+BIRD_TYPES = {
+    "red": Bird,
+    "yellow": YellowBird,
+    "blue": BlueBird,
+    "explosive": ExplosiveBird,
+    "growing": GrowingBird,
+}
+
+
+class EntityStore:
+    """
+    Struct-of-arrays store of the entities in the level. Every object gets an entity id
+    with a row in the kind, flags and points arrays plus its object (and so its body)
+    in `objects`, and its shape maps to the id, so collision callbacks resolve an
+    arbiter with one dictionary lookup and counts and filters are array operations.
+    Ids of removed entities are reused. The guards of the bird actions (has_split and
+    the like) stay on the birds, which are the only ones reading them.
+    """
+    PIG = 1
+    COLUMN = 2
+    BIRD = 3
+    # bits de flags
+    ALIVE = 1
+    # puntos por destruir cada tipo
+    POINTS = {PIG: 100, COLUMN: 35}
+    KINDS = {COLLISION_PIG: PIG, COLLISION_STRUCTURE: COLUMN, COLLISION_BIRD: BIRD}
+
+    def __init__(self, capacity: int = 64):
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.points = np.zeros(capacity, dtype=np.int32)
+        self.objects = []
+        self.ids = {}
+        self.free = []
+
+    def add(self, obj) -> int:
+        if self.free:
+            entity = self.free.pop()
+            self.objects[entity] = obj
+        else:
+            entity = len(self.objects)
+            if entity == len(self.kind):
+                self.kind = np.resize(self.kind, 2 * entity)
+                self.flags = np.resize(self.flags, 2 * entity)
+                self.points = np.resize(self.points, 2 * entity)
+            self.objects.append(obj)
+        kind = self.KINDS[obj.shape.collision_type]
+        self.kind[entity] = kind
+        self.flags[entity] = self.ALIVE
+        self.points[entity] = self.POINTS.get(kind, 0)
+        self.ids[obj.shape] = entity
+        return entity
+
+    def remove(self, obj):
+        entity = self.ids.pop(obj.shape, None)
+        if entity is not None:
+            self.flags[entity] = 0
+            self.objects[entity] = None
+            self.free.append(entity)
+
+    def entity(self, shape):
+        return self.ids.get(shape)
+
+    def lookup(self, shape):
+        """
+        The object and kind of a shape, or None if the shape is not in the level.
+        """
+        entity = self.ids.get(shape)
+        if entity is None:
+            return None
+        return self.objects[entity], self.kind[entity]
+
+    def alive(self, kind: int) -> np.ndarray:
+        n = len(self.objects)
+        return np.flatnonzero((self.kind[:n] == kind) & (self.flags[:n] & self.ALIVE != 0))
+
+    def count(self, kind: int) -> int:
+        return len(self.alive(kind))
+
+    def clear(self):
+        self.objects.clear()
+        self.ids.clear()
+        self.free.clear()
+        self.flags[:] = 0
+
+    def __contains__(self, shape) -> bool:
+        return shape in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+
 class LevelManager:
-    def __init__(self, space):
+    """
+    Builds the objects of each level into the space. With prefetch enabled the next
+    level is built ahead of time on a worker thread, in a scratch space, so moving to
+    it only adds prebuilt bodies and shapes to the real space.
+    """
+    def __init__(self, space, pack: LevelPack = None, prefetch: bool = False):
         self.space = space
+        self.entities = EntityStore()
         self.current_level = 0
-        self.levels = [
-            self.level_1,
-            self.level_2,
-            self.level_3,
-            self.level_4,
-        ]
-
-    def load_level(self, sprites, world, birds):
-        sprites.clear()
+        self.levels = pack if pack is not None else LevelPack()
+        self.prefetch_enabled = prefetch
+        # índice del nivel -> Future con sus objetos ya construidos
+        self.prefetched = {}
+
+    @property
+    def level(self) -> Level:
+        return self.levels[self.current_level]
+
+    def load_level(self, world, birds):
         world.clear()
         birds.clear()
-        self.levels[self.current_level](sprites, world)
-        return len([obj for obj in world if isinstance(obj, Pig)])
+        self.entities.clear()
+        prefetched = self.prefetched.pop(self.current_level, None)
+        if prefetched is not None:
+            objects = prefetched.result()
+        else:
+            objects = self.build_level(self.current_level)
+        self.add_built_objects(objects, world)
+        return self.entities.count(EntityStore.PIG)
 
     def next_level(self):
         if self.current_level + 1 < len(self.levels):
@@ -341,60 +520,53 @@ class LevelManager:
             return True
         return False
 
-    def add_objects(self, columns_data, pigs_data, sprites, world):
+    def prefetch(self, index: int = None):
+        """
+        Start building a level, by default the next one, on the prefetch thread.
+        """
+        if not self.prefetch_enabled:
+            return
+        index = self.current_level + 1 if index is None else index
+        if index >= len(self.levels) or index in self.prefetched:
+            return
+        # solo se guarda un nivel adelantado
+        self.prefetched.clear()
+        self.prefetched[index] = PREFETCH_EXECUTOR.submit(self.build_level, index)
+
+    def build_level(self, index: int) -> list:
+        return self.create_objects(self.levels[index])
+
+    @staticmethod
+    def create_objects(level: Level) -> list:
+        """
+        Build the objects of a level outside the real space. The constructors add them
+        to a scratch space, they are taken out again to be added later in one batch.
+        """
+        scratch = pymunk.Space()
+        objects = []
+        for item in level.objects:
+            mass, elasticity, friction = MATERIALS[item.material]
+            if item.type == "pig":
+                obj = Pig(item.x, item.y, scratch, mass, elasticity, friction)
+            else:
+                obj = Column(item.x, item.y, scratch, mass, elasticity, friction)
+            obj.body.angle = item.angle
+            objects.append(obj)
+        scratch.remove(*[item for obj in objects for item in (obj.body, obj.shape)])
+        return objects
+
+    def add_built_objects(self, objects, world):
+        self.space.add(*[item for obj in objects for item in (obj.body, obj.shape)])
+        for obj in objects:
+            world.append(obj)
+            self.entities.add(obj)
+
+    def add_objects(self, columns_data, pigs_data, world):
         for x, y in columns_data:
             column = Column(x, y, self.space)
-            sprites.append(column)
             world.append(column)
+            self.entities.add(column)
         for x, y in pigs_data:
             pig = Pig(x, y, self.space)
-            sprites.append(pig)
             world.append(pig)
-            
-    def level_1(self, sprites, world):
-        columns_data = [
-            (600, 50),   
-        ]
-        pigs_data = [
-            (600, 100),
-        ]
-        self.add_objects(columns_data, pigs_data, sprites, world)
-
-    def level_2(self, sprites, world):
-        columns_data = [
-            (600, 50),
-            (800, 50),   
-        ]
-        pigs_data = [
-            (600, 100),
-            (750, 100),
-            (850, 100),
-        ]
-        self.add_objects(columns_data, pigs_data, sprites, world)
-
-            
-    def level_3(self, sprites, world):
-        columns_data = [
-            (700, 50),
-            (750, 50), 
-            (850, 50),
-            (900, 50),    
-        ]
-        pigs_data = [
-            (800, 50),
-        ]
-        self.add_objects(columns_data, pigs_data, sprites, world)
-    def level_4(self, sprites, world):
-        columns_data = [
-            (650, 50),
-            (700, 50),   
-            (800, 50),   
-            (850, 50),   
-
-        ]
-        pigs_data = [
-            (675, 100),
-            (825, 100),
-        ]
-        self.add_objects(columns_data, pigs_data, sprites, world)
-
+            self.entities.add(pig)
@@ -0,0 +1,232 @@
+"""
+Seeded procedural levels for scaling tests. Builds towers, pyramids and wide fields of
+columns and pigs with a given object count, either registered on a running pack or
+written to a JSON Lines pack. Structures keep a height that stands still under its own
+weight however many objects there are, a level that needs more room gets wider than
+the window:
+
+    python level_generator.py tower 2000 --seed 1 --out levels/stress.jsonl
+    python level_generator.py field 5000 --density 0.5 --out levels/stress.jsonl
+
+It also picks pymunk's broadphase for a level: the default BBTree, or a spatial hash
+with a cell size taken from the object sizes when there are many objects of similar
+size, which is where the hash wins.
+"""
+import argparse
+import math
+import random
+import statistics
+
+from game_object import COLUMN_SIZE, PIG_RADIUS
+from level_pack import Level, LevelObject, save_pack
+
+LAYOUTS = ("tower", "pyramid", "field")
+BROADPHASES = ("bbtree", "hash", "auto")
+STRUCTURE_MATERIALS = ("wood", "stone", "ice")
+
+FLOOR_Y = 15
+FIRST_X = 500
+LAST_X = 1750
+# pisos y filas que aguantan su propio peso sin que los impulsos de reposo pasen el
+# umbral de destrucción, con más objetos el nivel se ensancha
+MAX_TOWER_FLOORS = 2
+MAX_PYRAMID_ROWS = 6
+MAX_FIELD_ROWS = 4
+# separación entre columnas acostadas, de canto a canto se traban y saltan
+BRICK_GAP = 2
+# espacio entre el último objeto y la pared derecha
+RIGHT_MARGIN = 50
+COLUMN_WIDTH, COLUMN_HEIGHT = COLUMN_SIZE
+
+# el hash solo conviene con muchos objetos de tamaños parecidos
+HASH_MIN_OBJECTS = 200
+HASH_MAX_SPREAD = 4
+
+
+def generate_level(layout: str, count: int, density: float = 1.0, seed: int = 0, min_score: int = 0) -> Level:
+    """
+    Build a level with about `count` objects. `density` in (0, 1] scales the gaps
+    between structures, 1 packs them as close as they fit.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r}, expected one of {LAYOUTS}")
+    if count < 2:
+        raise ValueError("a generated level needs at least two objects")
+    if not 0 < density <= 1:
+        raise ValueError("density must be in (0, 1]")
+    rng = random.Random(seed)
+    builder = {"tower": build_towers, "pyramid": build_pyramids, "field": build_field}[layout]
+    objects = builder(count, density, rng)[:count]
+    if not any(obj.type == "pig" for obj in objects):
+        # el cerdo toma el lugar de la última columna, apoyado donde ella se apoyaba
+        last = objects[-1]
+        half_height = (COLUMN_WIDTH * abs(math.sin(last.angle)) + COLUMN_HEIGHT * abs(math.cos(last.angle))) / 2
+        objects[-1] = pig(last.x, last.y - half_height + PIG_RADIUS)
+    right = max(obj.x + object_extent(obj) / 2 for obj in objects)
+    width = math.ceil(right) + RIGHT_MARGIN if right > LAST_X else None
+    return Level(f"{layout} {count} (seed {seed})", objects, min_score, width)
+
+
+def generate_pack(layout: str, counts, density: float = 1.0, seed: int = 0):
+    return [generate_level(layout, count, density, seed + i) for i, count in enumerate(counts)]
+
+
+def column(rng, x, y, lying=False, material=None) -> LevelObject:
+    angle = math.pi / 2 if lying else 0
+    return LevelObject("column", x, y, angle, material or rng.choice(STRUCTURE_MATERIALS))
+
+
+def pig(x, y) -> LevelObject:
+    return LevelObject("pig", x, y, material="pig")
+
+
+def build_towers(count, density, rng):
+    """
+    Towers of floors, each floor two standing columns with a pig between them and
+    a lying column on top. Towers grow taller once the row of towers is full, and
+    once they reach MAX_TOWER_FLOORS there are more towers past the right edge.
+    """
+    tower_width = 2 * COLUMN_WIDTH + 2 * PIG_RADIUS + 4
+    spacing = tower_width + COLUMN_HEIGHT * (1 / density - 1) + 10
+    floor_height = COLUMN_HEIGHT + COLUMN_WIDTH
+    towers = max(1, int((LAST_X - FIRST_X) // spacing))
+    floors = min(MAX_TOWER_FLOORS, math.ceil(count / 4 / towers))
+    towers = max(towers, math.ceil(count / 4 / floors))
+    # cada torre es de un solo material, una columna liviana bajo otra pesada la aplasta
+    materials = [rng.choice(STRUCTURE_MATERIALS) for _ in range(towers)]
+    objects = []
+    for floor in range(floors):
+        base = FLOOR_Y + floor * floor_height
+        for tower, material in enumerate(materials):
+            x = FIRST_X + tower * spacing + COLUMN_HEIGHT / 2
+            offset = (tower_width - COLUMN_WIDTH) / 2
+            objects.append(column(rng, x - offset, base + COLUMN_HEIGHT / 2, material=material))
+            objects.append(column(rng, x + offset, base + COLUMN_HEIGHT / 2, material=material))
+            objects.append(pig(x, base + PIG_RADIUS))
+            objects.append(column(rng, x, base + COLUMN_HEIGHT + COLUMN_WIDTH / 2, lying=True, material=material))
+    return objects
+
+
+def build_pyramids(count, density, rng):
+    """
+    Pyramids of lying columns with a pig on each step they leave uncovered. A pyramid
+    is as wide as the level and MAX_PYRAMID_ROWS allow, when one is not enough
+    more of them stand side by side, a brick apart.
+    """
+    gap = COLUMN_WIDTH * (1 / density - 1) + BRICK_GAP
+    brick = COLUMN_HEIGHT + gap
+    max_base = max(1, min(int((LAST_X - FIRST_X + gap) // brick), MAX_PYRAMID_ROWS))
+
+    def capacity(base):
+        return base * (base + 1) // 2 + 2 * (base - 1)
+
+    base = 1
+    while base < max_base and capacity(base) < count:
+        base += 1
+    # cada pirámide ocupa su base más un ladrillo de separación
+    pyramid_spacing = (base + 1) * brick
+
+    objects = []
+    for pyramid in range(math.ceil(count / capacity(base))):
+        left = FIRST_X + pyramid * pyramid_spacing
+        for row in range(base):
+            bricks = base - row
+            y = FLOOR_Y + row * COLUMN_WIDTH + COLUMN_WIDTH / 2
+            row_left = left + row * brick / 2
+            for i in range(bricks):
+                objects.append(column(rng, row_left + i * brick + COLUMN_HEIGHT / 2, y, lying=True))
+            if row:
+                step_y = y - COLUMN_WIDTH / 2 + PIG_RADIUS
+                objects.append(pig(row_left - brick / 4, step_y))
+                objects.append(pig(row_left + bricks * brick - gap + brick / 4, step_y))
+    return objects
+
+
+def build_field(count, density, rng):
+    """
+    Rows of standing columns with pigs scattered in the gaps of the bottom one, each
+    new row standing on the one below. Rows span the width of the level, or more when
+    MAX_FIELD_ROWS rows are not enough, with about half as many pigs as columns
+    in a row.
+    """
+    spacing = (COLUMN_WIDTH + 2 * PIG_RADIUS + 4) / density
+    per_row = max(1, int((LAST_X - FIRST_X) // spacing), math.ceil(count / (MAX_FIELD_ROWS + 0.5)))
+    objects = []
+    row = 0
+    while len(objects) < count:
+        y = FLOOR_Y + row * COLUMN_HEIGHT
+        for i in range(per_row):
+            x = FIRST_X + i * spacing
+            objects.append(column(rng, x, y + COLUMN_HEIGHT / 2))
+            if row == 0 and rng.random() < 0.5:
+                objects.append(pig(x + spacing / 2, y + PIG_RADIUS))
+        row += 1
+    return objects
+
+
+def object_extent(obj: LevelObject) -> float:
+    """
+    Side of the axis aligned bounding box of a level object, the larger one.
+    """
+    if obj.type == "pig":
+        return 2 * PIG_RADIUS
+    width, height = COLUMN_SIZE
+    cos, sin = abs(math.cos(obj.angle)), abs(math.sin(obj.angle))
+    return max(width * cos + height * sin, width * sin + height * cos)
+
+
+def spatial_hash_params(level: Level):
+    """
+    Cell size and cell count of a spatial hash for a level: cells about as large as a
+    typical object and about ten times more cells than objects.
+    """
+    extents = [object_extent(obj) for obj in level.objects]
+    return statistics.median(extents), 10 * len(extents)
+
+
+def choose_broadphase(level: Level):
+    """
+    Returns None to keep the BBTree, or the (cell size, cell count) of a spatial hash.
+    """
+    if len(level.objects) < HASH_MIN_OBJECTS:
+        return None
+    extents = [object_extent(obj) for obj in level.objects]
+    if max(extents) / min(extents) > HASH_MAX_SPREAD:
+        return None
+    return spatial_hash_params(level)
+
+
+def use_broadphase(space, level: Level, mode: str = "auto") -> str:
+    """
+    Set the broadphase of a space for a level, returns the one in use. pymunk cannot
+    go back to the BBTree once a space uses a spatial hash, so this belongs right after
+    creating the space.
+    """
+    if mode not in BROADPHASES:
+        raise ValueError(f"unknown broadphase {mode!r}, expected one of {BROADPHASES}")
+    if mode == "bbtree":
+        return "bbtree"
+    hash_params = spatial_hash_params(level) if mode == "hash" else choose_broadphase(level)
+    if hash_params is None:
+        return "bbtree"
+    dim, cells = hash_params
+    space.use_spatial_hash(dim, cells)
+    return f"hash ({dim:.0f}px, {cells} cells)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("layout", choices=LAYOUTS)
+    parser.add_argument("counts", type=int, nargs="+", help="objetos de cada nivel")
+    parser.add_argument("--density", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", metavar="PATH", required=True)
+    args = parser.parse_args()
+    levels = generate_pack(args.layout, args.counts, args.density, args.seed)
+    save_pack(levels, args.out)
+    for level in levels:
+        print(f"{level.name}: {len(level.objects)} objetos, broadphase {choose_broadphase(level) or 'bbtree'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+File based levels. A level pack is a JSON Lines file, one level per line:
+
+    {"name": "Nivel 1", "min_score": 0, "objects": [
+        {"type": "column", "x": 600, "y": 50, "angle": 0, "material": "wood"},
+        {"type": "pig", "x": 600, "y": 100}]}
+
+A level wider than the window, e.g. a large generated one, adds "width" in pixels,
+the floor and the right wall of the simulation are placed by it.
+
+Opening a pack only records where each line starts. A level is parsed and validated
+the first time it is requested and cached afterwards, so packs with thousands of
+generated levels open without reading them.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+DEFAULT_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels", "default.jsonl")
+
+OBJECT_TYPES = ("column", "pig")
+
+# masa, elasticidad y fricción de cada material
+MATERIALS = {
+    "wood": (2, 0.8, 1),
+    "stone": (6, 0.4, 1.2),
+    "ice": (1, 0.9, 0.1),
+    "pig": (2, 0.8, 0.4),
+}
+
+
+class LevelFormatError(ValueError):
+    pass
+
+
+@dataclass
+class LevelObject:
+    type: str
+    x: float
+    y: float
+    angle: float = 0
+    material: str = "wood"
+
+
+@dataclass
+class Level:
+    name: str
+    objects: List[LevelObject] = field(default_factory=list)
+    min_score: int = 0
+    # ancho del nivel, None usa el de la ventana
+    width: float = None
+
+
+def parse_level(data: dict, where: str = "level") -> Level:
+    if not isinstance(data, dict):
+        raise LevelFormatError(f"{where}: expected an object")
+    objects = data.get("objects")
+    if not isinstance(objects, list) or not objects:
+        raise LevelFormatError(f"{where}: 'objects' must be a non empty list")
+    min_score = data.get("min_score", 0)
+    if not isinstance(min_score, int) or min_score < 0:
+        raise LevelFormatError(f"{where}: 'min_score' must be a non negative integer")
+
+    width = data.get("width")
+    if width is not None and (isinstance(width, bool) or not isinstance(width, (int, float)) or width <= 0):
+        raise LevelFormatError(f"{where}: 'width' must be a positive number")
+
+    level = Level(str(data.get("name", where)), min_score=min_score, width=width)
+    for i, item in enumerate(objects):
+        item_where = f"{where}, object {i}"
+        if not isinstance(item, dict):
+            raise LevelFormatError(f"{item_where}: expected an object")
+        kind = item.get("type")
+        if kind not in OBJECT_TYPES:
+            raise LevelFormatError(f"{item_where}: unknown type {kind!r}")
+        material = item.get("material", "pig" if kind == "pig" else "wood")
+        if material not in MATERIALS:
+            raise LevelFormatError(f"{item_where}: unknown material {material!r}")
+        try:
+            x = float(item["x"])
+            y = float(item["y"])
+            angle = float(item.get("angle", 0))
+        except (KeyError, TypeError, ValueError):
+            raise LevelFormatError(f"{item_where}: 'x' and 'y' must be numbers") from None
+        level.objects.append(LevelObject(kind, x, y, angle, material))
+    if not any(obj.type == "pig" for obj in level.objects):
+        raise LevelFormatError(f"{where}: a level needs at least one pig")
+    return level
+
+
+class LevelPack:
+    """
+    Lazily parsed list of levels backed by a JSON Lines file.
+    """
+    def __init__(self, path: str = DEFAULT_PACK):
+        self.path = path
+        self.offsets = []
+        self.cache = {}
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    self.offsets.append(offset)
+                offset += len(line)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> Level:
+        level = self.cache.get(index)
+        if level is None:
+            with open(self.path, "rb") as f:
+                f.seek(self.offsets[index])
+                line = f.readline()
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise LevelFormatError(f"{self.path}, level {index}: {e}") from None
+            level = parse_level(data, f"{self.path}, level {index}")
+            self.cache[index] = level
+        return level
+
+    def append(self, level: Level):
+        """
+        Register an in-memory level, e.g. a generated one, after the levels in the file.
+        """
+        self.cache[len(self.offsets)] = level
+        self.offsets.append(None)
+
+    def validate(self):
+        """
+        Parse every level once, raising LevelFormatError on the first invalid one.
+        """
+        for index in range(len(self)):
+            self[index]
+
+
+def save_pack(levels, path: str):
+    with open(path, "w") as f:
+        for level in levels:
+            data = {
+                "name": level.name,
+                "min_score": level.min_score,
+                "objects": [obj.__dict__ for obj in level.objects],
+            }
+            if level.width is not None:
+                data["width"] = level.width
+            f.write(json.dumps(data, separators=(",", ":")) + "\n")
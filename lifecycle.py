@@ -0,0 +1,58 @@
+class LifecycleManager:
+    """
+    Keeps the space, the bird list and the sprites proportional to what is still in
+    play. Resting bodies are put to sleep by pymunk, and every `sweep_interval` steps a
+    sweep removes, in one batch, the bodies that left the level and the oldest spent
+    birds over `max_spent_birds`. Pigs and columns that left the level count as
+    destroyed, worth no points.
+    """
+    def __init__(
+        self,
+        simulation,
+        width: float,
+        margin: float = 100,
+        sleep_time_threshold: float = 0.5,
+        sweep_interval: int = 30,
+        max_spent_birds: int = 12,
+    ):
+        self.simulation = simulation
+        self.margin = margin
+        self.min_x = -margin
+        self.max_x = width + margin
+        self.min_y = -margin
+        self.sweep_interval = sweep_interval
+        self.max_spent_birds = max_spent_birds
+        self.sleep_time_threshold = sleep_time_threshold
+
+    def configure(self, space, width: float):
+        # idle_speed_threshold en 0 deja que pymunk lo estime a partir de la gravedad
+        space.sleep_time_threshold = self.sleep_time_threshold
+        self.max_x = width + self.margin
+
+    def after_step(self):
+        if self.simulation.level_steps % self.sweep_interval == 0:
+            self.sweep()
+
+    def is_out_of_bounds(self, obj) -> bool:
+        position = obj.body.position
+        return position.x < self.min_x or position.x > self.max_x or position.y < self.min_y
+
+    def sweep(self):
+        simulation = self.simulation
+        lost = [obj for obj in simulation.world if self.is_out_of_bounds(obj)]
+        if lost:
+            entities = simulation.entities
+            simulation.remove_destroyed({entities.entity(obj.shape): obj for obj in lost}, scored=False)
+        dead = []
+        spent = []
+        for bird in simulation.birds:
+            if bird is simulation.active_bird:
+                continue
+            if self.is_out_of_bounds(bird):
+                dead.append(bird)
+            else:
+                spent.append(bird)
+        if len(spent) > self.max_spent_birds:
+            dead.extend(spent[:len(spent) - self.max_spent_birds])
+        if dead:
+            simulation.remove_many(dead)
@@ -1,13 +1,19 @@
+import argparse
 import math
 import logging
 import arcade
 import arcade.key
 import arcade.key
-import pymunk
 import time
 
-from game_object import Bird, Column, LevelManager, Pig, YellowBird, BlueBird, ExplosiveBird, GrowingBird
-from game_logic import get_impulse_vector, Point2D, get_distance
+from asset_manifest import AssetManifest
+from controller import Controller, PREVIEW_STEPS, PREVIEW_STRIDE
+from game_logic import get_angle_radians, get_distance
+from game_object import PREFETCH_EXECUTOR
+from profiler import FrameProfiler
+from replay import InputRecorder
+from simulation import GAME_OVER, Simulation, SOLVER_ITERATIONS, SOLVER_THREADS, WIDTH, HEIGHT
+from sprites import EntitySprite, SPRITE_KINDS, SpriteSync
 
 logging.basicConfig(level=logging.DEBUG)
 logging.getLogger("arcade").setLevel(logging.WARNING)
@@ -16,214 +22,267 @@ logging.getLogger("PIL").setLevel(logging.WARNING)
 
 logger = logging.getLogger("main")
 
-WIDTH = 1800
-HEIGHT = 600
 TITLE = "Angry birds"
-GRAVITY = -900
-MAX_BIRDS = 3
+CHECKPOINT_PATH = "checkpoint.snap"
+PROFILE_PATH = "profile"
 
 
 class App(arcade.Window):
-    def __init__(self):
+    def __init__(self, record_path=None, checkpoint_path=CHECKPOINT_PATH, resume=False,
+                 threads=SOLVER_THREADS, iterations=SOLVER_ITERATIONS):
         super().__init__(WIDTH, HEIGHT, TITLE)
-        self.background = arcade.load_texture("assets/img/background3.png")
-        # crear espacio de pymunk
-        self.space = pymunk.Space()
-        self.space.gravity = (0, GRAVITY)
-
-        # agregar piso
-        floor_body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        floor_shape = pymunk.Segment(floor_body, [0, 15], [WIDTH, 15], 0.0)
-        floor_shape.friction = 10
-        self.space.add(floor_body, floor_shape)
-        floor_body.tag = 'static'
-
-        
-        right_wall_body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        right_wall_shape = pymunk.Segment(right_wall_body, [WIDTH, 0], [WIDTH, HEIGHT], 0.0)
-        right_wall_shape.friction = 10
-        self.space.add(right_wall_body, right_wall_shape)
-        right_wall_body.tag = 'static'
+        # texturas compartidas, las del nivel van al atlas antes del primer cuadro
+        self.assets = AssetManifest()
+        # fondo, textos y apuntado se crean una vez y solo se actualizan cuando cambian
+        self.background = arcade.SpriteList()
+        background = arcade.Sprite(texture=self.assets.texture("background"))
+        background.width = WIDTH
+        background.height = HEIGHT
+        background.position = (WIDTH / 2, HEIGHT / 2)
+        self.background.append(background)
+        # toda la física y las reglas viven en la simulación, aquí solo se dibuja
+        if resume:
+            self.simulation = Simulation.load_checkpoint(checkpoint_path, threads=threads, iterations=iterations,
+                                                         prefetch=True)
+        else:
+            self.simulation = Simulation(threads=threads, iterations=iterations, prefetch=True)
+        self.checkpoint_path = checkpoint_path
+        self.simulation.on_spawn = self.add_sprite
+        self.simulation.on_remove = self.remove_sprite
+        self.simulation.on_level_loaded = self.load_sprites
+        self.simulation.on_state_change = self.on_state_change
+
+        # el apuntado y el lanzamiento no dependen de la ventana, así se pueden grabar
+        self.controller = Controller(self.simulation)
+        self.record_path = record_path
+        if record_path:
+            self.controller.recorder = InputRecorder(self.simulation)
 
         self.sprites = arcade.SpriteList()
-        self.birds = arcade.SpriteList()
-        self.world = arcade.SpriteList()
-        self.level_manager = LevelManager(self.space)
-        self.level_manager.load_level(self.sprites, self.world, self.birds)
-        self.mouse_press = None
-
-        self.start_point = Point2D()
-        self.end_point = Point2D()
-        self.distance = 0
-        self.draw_line = False
-        self.bird_count = 0 
-
-        # agregar un collision handler
-        self.handler = self.space.add_default_collision_handler()
-        self.handler.post_solve = self.collision_handler
-        
-        # que cambie de tipo de pájaro, aquí se guarda
-        self.bird_type = Bird
-        self.bird_image = "assets/img/red-bird3.png"      
-
-        # para que se pueda hacer click dos veces y no se dibuje, sino se aumente la velocidad del pajaro amarillo o se divida el pajáro azul
-        self.bird_flying = False
-        self.active_bird = None
-        self.game_over = False
-        self.isWin = False
+        self.sprite_sync = SpriteSync()
+        self.simulation.on_last_step = self.capture_previous
+        self.entity_sprites = {}
+        # los sprites se reutilizan igual que los cuerpos: al reiniciar un nivel o
+        # reciclar un fragmento vuelve el mismo objeto del juego
+        self.parked_sprites = {}
+        self.sprites_level = None
+        self.load_sprites()
+
         self.end_time = None
         self.time_to_close = 3
-        
-        # Niveles y puntaje
-        self.score = 0
-        self.total_score = 0
-        self.remaining_pigs = len([obj for obj in self.world if isinstance(obj, Pig)])
-
-
-    def collision_handler(self, arbiter, space, data):
-        impulse_norm = arbiter.total_impulse.length
-        if impulse_norm < 1000:
-            return True
-        logger.debug(impulse_norm)
-        if impulse_norm > 1200:
-            for obj in self.world:
-                if obj.shape in arbiter.shapes:
-                    if isinstance(obj, Pig):
-                        self.score += 100
-                        self.remaining_pigs -= 1
-                    elif isinstance(obj, Column):
-                        self.score += 35
-                    obj.remove_from_sprite_lists()
-                    self.space.remove(obj.shape, obj.body)
-        for bird in self.birds:
-            if bird.shape in arbiter.shapes:
-                self.bird_flying = False
-                self.active_bird = None
-                break
-        
-        return True
-            
-    def setup_level(self):
-        for body in list(self.space.bodies):
-            if not getattr(body, 'tag', None) == 'static':
-                for shape in list(body.shapes):
-                    self.space.remove(shape)
-                self.space.remove(body)
-        self.level_manager.load_level(self.sprites, self.world, self.birds)
-        self.bird_count = 0
-        self.score = 0
-        self.remaining_pigs = len([obj for obj in self.world if isinstance(obj, Pig)])
 
+        # P muestra los tiempos por fase, T los exporta a profile.csv y profile.json
+        self.profiler = FrameProfiler()
+        self.simulation.profiler = self.profiler
+        self.collision_count = 0
 
-    def on_update(self, delta_time: float):
-        if self.game_over or self.isWin:
-            if self.end_time is None:
-                self.end_time = time.time()  
+        self.score_text = arcade.Text("Puntaje: 0", 10, HEIGHT - 30, arcade.color.WHITE, font_size=20)
+        self.shown_score = 0
+        self.lose_text = arcade.Text("¡Perdiste!", WIDTH // 2, HEIGHT // 2, arcade.color.RED,
+                                     font_size=50, anchor_x="center")
+        self.win_text = arcade.Text("¡Ganaste!", WIDTH // 2, HEIGHT // 2, arcade.color.RED,
+                                    font_size=50, anchor_x="center")
+        self.profile_texts = []
+        self.aim = arcade.SpriteList()
+        self.aim_line = arcade.SpriteSolidColor(1, 3, arcade.color.BLACK)
+        self.aim.append(self.aim_line)
+        self.aim_dots = [arcade.SpriteCircle(2, arcade.color.WHITE) for _ in range(PREVIEW_STEPS // PREVIEW_STRIDE)]
+        self.aim.extend(self.aim_dots)
+        self.aimed = None
+
+    def load_sprites(self):
+        self.parked_sprites.update(self.entity_sprites)
+        level = self.simulation.level_manager.current_level
+        if level != self.sprites_level:
+            # los objetos del nivel anterior no vuelven, solo los fragmentos
+            self.parked_sprites = {obj: sprite for obj, sprite in self.parked_sprites.items()
+                                   if getattr(obj, "is_fragment", False)}
+            self.sprites_level = level
+            self.preload_level()
+        self.entity_sprites.clear()
+        self.sprites.clear()
+        self.sprite_sync.clear()
+        # un nivel recién cargado no tiene pájaros, uno retomado de un checkpoint sí
+        for obj in self.simulation.world + self.simulation.birds:
+            self.add_sprite(obj)
+
+    def preload_level(self):
+        """
+        Load the textures of the current level and of the selected bird, the rest load
+        when something of their kind first spawns.
+        """
+        kinds = {SPRITE_KINDS[type(obj)] for obj in self.simulation.world}
+        kinds.add(SPRITE_KINDS[self.controller.bird_type])
+        self.assets.preload(kinds, self.ctx.default_atlas)
+        # las imágenes del nivel siguiente se leen en el hilo que lo construye, el atlas
+        # (OpenGL) solo se toca desde este hilo
+        level_manager = self.simulation.level_manager
+        next_level = level_manager.current_level + 1
+        if next_level < len(level_manager.levels):
+            PREFETCH_EXECUTOR.submit(self.preload_textures, level_manager.levels, next_level)
+
+    def preload_textures(self, levels, index):
+        # los tipos de objeto de un nivel ("pig", "column") son también tipos del manifiesto
+        self.assets.preload({obj.type for obj in levels[index].objects})
 
+    def add_sprite(self, obj):
+        sprite = self.parked_sprites.pop(obj, None)
+        if sprite:
+            sprite.update()
+        else:
+            sprite = EntitySprite(obj, self.assets)
+        self.sprites.append(sprite)
+        self.sprite_sync.add(obj, sprite)
+        self.entity_sprites[obj] = sprite
+
+    def remove_sprite(self, obj):
+        sprite = self.entity_sprites.pop(obj, None)
+        if sprite:
+            sprite.remove_from_sprite_lists()
+            self.sprite_sync.remove(obj)
+            self.parked_sprites[obj] = sprite
+
+    def on_state_change(self, previous, state):
+        # la ventana se cierra unos segundos después de perder o de ganar el juego
+        if state == GAME_OVER or self.simulation.is_win:
+            self.end_time = time.time()
+
+    def on_update(self, delta_time: float):
+        self.profiler.begin_frame()
+        if self.end_time is not None:
             if time.time() - self.end_time > self.time_to_close:
                 self.close()
             return
-        self.space.step(1 / 60.0)
-        self.update_collisions()
-        self.sprites.update()
-        self.check_active_bird()
-        if self.bird_count >= MAX_BIRDS and self.remaining_pigs > 0 and not self.bird_flying:
-            self.game_over = True
-            self.total_score += self.score
-            logger.debug(f"¡Perdiste! Puntaje acumulado: {self.total_score}")
-            self.setup_level()
-        if self.remaining_pigs == 0 and self.bird_count >= MAX_BIRDS and not self.bird_flying:
-            if self.level_manager.next_level():
-                self.total_score += self.score
-                self.setup_level()
-            else:
-                logger.debug("¡Juego completado!")
-                logger.debug(f"Puntaje acumulado: {self.total_score}")
-                self.isWin = True
-                self.setup_level()
-
+        # la simulación marca sus propias fases: space, collisions, active_bird y rules
+        alpha = self.simulation.advance(delta_time)
+        self.sprite_sync.sync(self.simulation.steps, alpha)
+        self.profiler.mark("sync")
 
-    def update_collisions(self):
-        pass
+    def capture_previous(self):
+        self.sprite_sync.capture_previous(self.simulation.steps)
+        self.profiler.mark("sync")
 
     def on_mouse_press(self, x, y, button, modifiers):
         if button == arcade.MOUSE_BUTTON_LEFT:
-            if self.bird_flying:
-                if isinstance(self.active_bird, YellowBird) and not self.active_bird.has_boosted:
-                    self.active_bird.boost()
-                if isinstance(self.active_bird, BlueBird) and not self.active_bird.has_split:
-                    self.active_bird.split(self)
-                if isinstance(self.active_bird, ExplosiveBird) and not self.active_bird.has_exploded:
-                    self.active_bird.explode(self)
-                if isinstance(self.active_bird, GrowingBird) and not self.active_bird.has_growth:
-                    self.active_bird.growth()
-            else:
-                self.start_point = Point2D(x, y)
-                self.end_point = Point2D(x, y)
-                self.draw_line = True
-                logger.debug(f"Start Point: {self.start_point}")
-           
+            self.controller.press(x, y)
+
     def on_mouse_drag(self, x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int):
         if buttons == arcade.MOUSE_BUTTON_LEFT:
-            self.end_point = Point2D(x, y)
-            logger.debug(f"Dragging to: {self.end_point}") 
-    
+            self.controller.drag(x, y)
+
     def on_mouse_release(self, x: int, y: int, button: int, modifiers: int):
-        if button == arcade.MOUSE_BUTTON_LEFT and not self.bird_flying:
-            logger.debug(f"Releasing from: {self.end_point}")
-            self.draw_line = False
-            impulse_vector = get_impulse_vector(self.start_point, self.end_point)
-            self.bird_count += 1 
-            bird = self.bird_type(self.bird_image, impulse_vector, x, y, self.space)
-            self.sprites.append(bird)
-            self.birds.append(bird)
-            self.bird_flying = True
-            self.active_bird = bird
-        else:
-                logger.debug("¡No puedes lanzar más pájaros!")
-
-    def check_active_bird(self):
-        if self.active_bird:
-            if self.active_bird.body.position.y < 10 or \
-            self.active_bird.body.position.x < 0 or \
-            self.active_bird.body.position.x > WIDTH or \
-            self.active_bird.body.position.y > HEIGHT or \
-            self.active_bird.body.velocity.length < 10:
-                self.active_bird = None
-                self.bird_flying = False                
+        if button == arcade.MOUSE_BUTTON_LEFT:
+            self.controller.release(x, y)
+
     def on_key_release(self, symbol: int, modifiers: int):
-        if symbol == arcade.key.R: 
-            self.bird_type = Bird
-            self.bird_image = "assets/img/red-bird3.png"
-        elif symbol == arcade.key.B: 
-            self.bird_type = BlueBird
-            self.bird_image = "assets/img/blue.png"       
+        if symbol == arcade.key.R:
+            self.controller.select_bird("red")
+        elif symbol == arcade.key.B:
+            self.controller.select_bird("blue")
         elif symbol == arcade.key.Y:
-            self.bird_type = YellowBird
-            self.bird_image = "assets/img/chuck.png"
+            self.controller.select_bird("yellow")
         elif symbol == arcade.key.E:
-            self.bird_type = ExplosiveBird
-            self.bird_image = "assets/img/explosive.png"
+            self.controller.select_bird("explosive")
         elif symbol == arcade.key.G:
-            self.bird_type = GrowingBird
-            self.bird_image = "assets/img/growing.png"
-              
-        
+            self.controller.select_bird("growing")
+        elif symbol == arcade.key.P:
+            self.profiler.enabled = not self.profiler.enabled
+            self.collision_count = self.simulation.collision_count
+        elif symbol == arcade.key.T:
+            self.profiler.export_csv(f"{PROFILE_PATH}.csv")
+            self.profiler.export_chrome_trace(f"{PROFILE_PATH}.json")
+            logger.debug(f"Perfil exportado a {PROFILE_PATH}.csv y {PROFILE_PATH}.json")
+        elif symbol == arcade.key.K:
+            if self.simulation.can_checkpoint:
+                self.simulation.save_checkpoint(self.checkpoint_path)
+                logger.debug(f"Partida guardada en {self.checkpoint_path}")
+            else:
+                logger.debug("Solo se puede guardar apuntando, con todo quieto")
+        # el pájaro elegido ya tiene su textura lista para el lanzamiento
+        self.assets.preload([SPRITE_KINDS[self.controller.bird_type]], self.ctx.default_atlas)
+
+    def close(self):
+        if self.record_path:
+            self.controller.recorder.save(self.record_path)
+            logger.debug(f"Sesión grabada en {self.record_path}")
+        super().close()
+
     def on_draw(self):
+        self.profiler.skip()
         arcade.start_render()
-        arcade.draw_lrwh_rectangle_textured(0, 0, WIDTH, HEIGHT, self.background)
+        self.background.draw()
+        self.profiler.mark("background")
         self.sprites.draw()
-        if self.draw_line:
-            arcade.draw_line(self.start_point.x, self.start_point.y, self.end_point.x, self.end_point.y,
-                             arcade.color.BLACK, 3)
-        arcade.draw_text(f"Puntaje: {self.score}", 10, HEIGHT - 30, arcade.color.WHITE, font_size=20)
-        if self.game_over:
-            arcade.draw_text("¡Perdiste!", WIDTH // 2, HEIGHT // 2, arcade.color.RED, font_size=50, anchor_x="center")
-        if self.isWin:
-            arcade.draw_text("¡Ganaste!", WIDTH // 2, HEIGHT // 2, arcade.color.RED, font_size=50, anchor_x="center")
+        self.profiler.mark("sprites")
+        if self.controller.draw_line:
+            self.update_aim()
+            self.aim.draw()
+        if self.simulation.score != self.shown_score:
+            self.shown_score = self.simulation.score
+            self.score_text.text = f"Puntaje: {self.shown_score}"
+        self.score_text.draw()
+        if self.simulation.game_over:
+            self.lose_text.draw()
+        if self.simulation.is_win:
+            self.win_text.draw()
+        if self.profiler.enabled:
+            self.draw_profile()
+        self.profiler.mark("hud")
+        if self.profiler.enabled:
+            collisions = self.simulation.collision_count - self.collision_count
+            self.collision_count = self.simulation.collision_count
+            self.profiler.end_frame(
+                collisions=collisions,
+                bodies=len(self.simulation.space.bodies),
+                sprites=len(self.sprites),
+            )
+
+    def update_aim(self):
+        """
+        Move the aim line and the trajectory dots, only when the drag changed.
+        """
+        start_point = self.controller.start_point
+        end_point = self.controller.end_point
+        aimed = (start_point.x, start_point.y, end_point.x, end_point.y, self.controller.bird_type)
+        if aimed == self.aimed:
+            return
+        self.aimed = aimed
+        self.aim_line.width = max(get_distance(start_point, end_point), 1)
+        self.aim_line.position = ((start_point.x + end_point.x) / 2, (start_point.y + end_point.y) / 2)
+        self.aim_line.radians = get_angle_radians(start_point, end_point)
+        trajectory = self.controller.trajectory().tolist()
+        for i, dot in enumerate(self.aim_dots):
+            dot.visible = i < len(trajectory)
+            if dot.visible:
+                dot.position = tuple(trajectory[i])
+
+    def draw_profile(self):
+        summary = self.profiler.summary()
+        while len(self.profile_texts) < len(summary):
+            y = HEIGHT - 60 - 18 * len(self.profile_texts)
+            self.profile_texts.append(arcade.Text("", 10, y, arcade.color.WHITE, font_size=12, font_name="Courier New"))
+        for text, (phase, (p50, p99)) in zip(self.profile_texts, summary.items()):
+            line = f"{phase:>10}  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms"
+            if text.text != line:
+                text.text = line
+            text.draw()
+
 
 def main():
-    app = App()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", metavar="PATH", help="grabar la sesión para reproducirla con replay.py")
+    parser.add_argument("--checkpoint", metavar="PATH", default=CHECKPOINT_PATH,
+                        help="archivo donde la tecla K guarda la partida")
+    parser.add_argument("--resume", action="store_true", help="continuar desde el archivo de --checkpoint")
+    parser.add_argument("--threads", type=int, default=SOLVER_THREADS,
+                        help="hilos del solver de pymunk, más de 1 usa el espacio con hilos (Linux y macOS)")
+    parser.add_argument("--iterations", type=int, default=SOLVER_ITERATIONS, help="iteraciones del solver por paso")
+    args = parser.parse_args()
+    if args.record and args.resume:
+        # una grabación se reproduce desde el inicio de su nivel, no desde una partida guardada
+        parser.error("--record no se puede combinar con --resume")
+    app = App(record_path=args.record, checkpoint_path=args.checkpoint, resume=args.resume,
+              threads=args.threads, iterations=args.iterations)
     arcade.run()
 
 
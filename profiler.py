@@ -0,0 +1,142 @@
+"""
+Per-frame profiler. Each frame is split into phases by calling mark() after each one,
+and ends with the counters of that frame. A phase can be marked several times in a
+frame (once per physics step), its time is the sum. Work that runs inside another
+phase, like the collision callbacks inside the solver, is added with nest(). When
+disabled every call returns right away, so it can stay wired into the game loop.
+"""
+import csv
+import json
+import time
+from collections import deque
+
+
+def phase_totals(phases) -> dict:
+    totals = {}
+    for phase, _, duration in phases:
+        totals[phase] = totals.get(phase, 0.0) + duration
+    return totals
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 300, max_frames: int = 36000):
+        self.enabled = False
+        # el cuadro en curso se está midiendo. Activar el perfil a mitad de un cuadro
+        # solo tiene efecto desde el próximo begin_frame
+        self.recording = False
+        self.window = window
+        # cada cuadro: (inicio, [(fase, inicio, duración)], contadores)
+        self.frames = deque(maxlen=max_frames)
+        self.phases = []
+        # tiempo de fases anidadas desde la última marca, se descuenta de la que cierra
+        self.nested = {}
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+
+    def begin_frame(self):
+        self.recording = self.enabled
+        if not self.recording:
+            return
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.phases = []
+        self.nested = {}
+
+    def mark(self, phase: str):
+        """
+        Close the phase that started at the previous mark (or at begin_frame). Nested
+        time since then is taken out of it and recorded right after it.
+        """
+        if not self.recording:
+            return
+        now = time.perf_counter()
+        start = self.last_mark
+        own = now - start - sum(self.nested.values())
+        self.phases.append((phase, start, own))
+        start += own
+        for name, duration in self.nested.items():
+            self.phases.append((name, start, duration))
+            start += duration
+        self.nested.clear()
+        self.last_mark = now
+
+    def nest(self, phase: str, duration: float):
+        """
+        Add time spent in a phase that runs inside the current one.
+        """
+        if not self.recording:
+            return
+        self.nested[phase] = self.nested.get(phase, 0.0) + duration
+
+    def skip(self):
+        """
+        Restart the clock without recording, for time spent outside the game loop.
+        """
+        if not self.recording:
+            return
+        self.nested.clear()
+        self.last_mark = time.perf_counter()
+
+    def end_frame(self, **counters):
+        if not self.recording:
+            return
+        self.recording = False
+        # el tiempo entre on_update y on_draw no es del juego, solo se suman las fases
+        counters["frame"] = sum(duration for _, _, duration in self.phases)
+        self.frames.append((self.frame_start, self.phases, counters))
+
+    def summary(self):
+        """
+        Rolling p50/p99 in milliseconds of every phase and of the whole frame.
+        """
+        recent = list(self.frames)[-self.window:]
+        durations = {}
+        for _, phases, counters in recent:
+            for phase, duration in phase_totals(phases).items():
+                durations.setdefault(phase, []).append(duration)
+            durations.setdefault("frame", []).append(counters["frame"])
+        return {
+            phase: (percentile(values, 0.5) * 1000, percentile(values, 0.99) * 1000)
+            for phase, values in durations.items()
+        }
+
+    def export_csv(self, path: str):
+        phase_names = []
+        for _, phases, _ in self.frames:
+            for phase, _, _ in phases:
+                if phase not in phase_names:
+                    phase_names.append(phase)
+        counter_names = sorted({name for _, _, counters in self.frames for name in counters} - {"frame"})
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms", *[f"{phase}_ms" for phase in phase_names], *counter_names])
+            for i, (_, phases, counters) in enumerate(self.frames):
+                durations = phase_totals(phases)
+                writer.writerow([
+                    i,
+                    f"{counters['frame'] * 1000:.4f}",
+                    *[f"{durations.get(phase, 0) * 1000:.4f}" for phase in phase_names],
+                    *[counters.get(name, "") for name in counter_names],
+                ])
+
+    def export_chrome_trace(self, path: str):
+        """
+        Write the frames in the Chrome trace event format (chrome://tracing, Perfetto).
+        """
+        events = []
+        for frame_start, phases, counters in self.frames:
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": frame_start * 1e6, "dur": counters["frame"] * 1e6})
+            for phase, start, duration in phases:
+                events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": start * 1e6, "dur": duration * 1e6})
+            events.append({"name": "counters", "ph": "C", "pid": 1, "ts": frame_start * 1e6,
+                           "args": {name: value for name, value in counters.items() if name != "frame"}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
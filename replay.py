@@ -0,0 +1,122 @@
+"""
+Deterministic input recording and replay. Input events are keyed by physics step
+index and every step stores a checksum of all body positions and velocities, so a
+replay can re-run a session headlessly at full speed and point at the first step
+where the physics diverged.
+
+    python main.py --record session.json
+    python replay.py session.json
+"""
+import argparse
+import json
+import struct
+import sys
+import zlib
+
+from controller import Controller
+from simulation import SOLVER_ITERATIONS, SOLVER_THREADS, Simulation
+
+# la versión 2 guarda también los ajustes del solver
+FORMAT_VERSION = 2
+
+
+def physics_checksum(space) -> int:
+    checksum = 0
+    for body in space.bodies:
+        position = body.position
+        velocity = body.velocity
+        checksum = zlib.crc32(struct.pack(
+            "<6d", position.x, position.y, velocity.x, velocity.y, body.angle, body.angular_velocity,
+        ), checksum)
+    return checksum
+
+
+class InputRecorder:
+    """
+    Logs controller input against the step index of the simulation and a checksum
+    after every physics step.
+    """
+    def __init__(self, simulation: Simulation, level: int = 0):
+        self.simulation = simulation
+        self.level = level
+        self.events = []
+        self.checksums = []
+        simulation.on_step = self.on_step
+
+    def record(self, kind: str, *args):
+        self.events.append([self.simulation.steps, kind, *args])
+
+    def on_step(self):
+        self.checksums.append(physics_checksum(self.simulation.space))
+
+    def save(self, path: str):
+        data = {
+            "version": FORMAT_VERSION,
+            "level": self.level,
+            "time_step": self.simulation.time_step,
+            "substeps": self.simulation.substeps,
+            "iterations": self.simulation.iterations,
+            "threads": self.simulation.threads,
+            "events": self.events,
+            "checksums": self.checksums,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+
+class ReplayMismatch(Exception):
+    def __init__(self, step: int, expected: int, actual: int):
+        super().__init__(f"physics diverged at step {step}: expected {expected:08x}, got {actual:08x}")
+        self.step = step
+
+
+def replay(path: str) -> int:
+    """
+    Re-run a recorded session without rendering. Returns the number of verified steps
+    and raises ReplayMismatch on the first step whose checksum differs.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    simulation = Simulation(
+        data["level"],
+        physics_rate=1 / data["time_step"],
+        substeps=data["substeps"],
+        threads=data.get("threads", SOLVER_THREADS),
+        iterations=data.get("iterations", SOLVER_ITERATIONS),
+    )
+    controller = Controller(simulation)
+    handlers = {
+        "press": controller.press,
+        "drag": controller.drag,
+        "release": controller.release,
+        "select_bird": controller.select_bird,
+    }
+    events = data["events"]
+    checksums = data["checksums"]
+    next_event = 0
+    for step, expected in enumerate(checksums):
+        while next_event < len(events) and events[next_event][0] <= step:
+            _, kind, *args = events[next_event]
+            handlers[kind](*args)
+            next_event += 1
+        simulation.step()
+        actual = physics_checksum(simulation.space)
+        if actual != expected:
+            raise ReplayMismatch(step, expected, actual)
+    return len(checksums)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    args = parser.parse_args()
+    try:
+        steps = replay(args.path)
+    except ReplayMismatch as e:
+        print(e)
+        sys.exit(1)
+    print(f"{steps} pasos verificados")
+
+
+if __name__ == "__main__":
+    main()
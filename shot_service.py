@@ -0,0 +1,204 @@
+"""
+Shot evaluation service. A long-lived asyncio server that answers shot requests from
+tools such as the level editor without opening a window. Requests and responses are
+JSON, one per line, over localhost TCP or a Unix socket:
+
+    python shot_service.py --port 8765
+    python shot_service.py --unix /tmp/shots.sock
+
+    -> {"id": 1, "level": 0, "bird": "blue", "angle": 0.35, "impulse": 60, "activate_at": 20}
+    <- {"id": 1, "score": 135, "remaining_pigs": 0, "pigs_killed": 1, "settle_time": 2.1,
+        "bodies": [[x, y, angle, vx, vy, angular_velocity], ...]}
+
+Concurrent requests are collected for a few milliseconds and sent as batches to a
+process pool. Every worker keeps one warm simulation per level and resets it from the
+level snapshot into a fresh space before each shot, so a query costs only the shot
+itself and gets the same answer on any worker, whatever ran there before.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from game_object import BIRD_TYPES
+from level_pack import LevelPack
+from shot_solver import MAX_STEPS, simulate_shot
+from simulation import Simulation
+from snapshot import get_body_state
+
+BATCH_SIZE = 32
+BATCH_WINDOW = 0.005
+
+# cada proceso del pool tiene una simulación ya cargada por nivel
+_worker_simulations = {}
+
+
+def _run_batch(level: int, shots: list) -> list:
+    simulation = _worker_simulations.get(level)
+    if simulation is None:
+        simulation = Simulation(level)
+        _worker_simulations[level] = simulation
+    results = []
+    for bird, angle, impulse, activate_at in shots:
+        result = simulate_shot(simulation, BIRD_TYPES[bird], angle, impulse, activate_at, MAX_STEPS)
+        results.append({
+            "score": result.score,
+            "remaining_pigs": simulation.remaining_pigs,
+            "pigs_killed": result.pigs_killed,
+            "settle_time": result.settle_time,
+            "bodies": [get_body_state(obj.body) for obj in simulation.world],
+        })
+    return results
+
+
+def is_integer(value) -> bool:
+    # bool es subclase de int, pero true no es un número de nivel
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_finite_number(value) -> bool:
+    # json acepta NaN e Infinity, un tiro así correría MAX_STEPS y no se puede responder
+    return (is_integer(value) or isinstance(value, float)) and math.isfinite(value)
+
+
+def parse_request(request: dict) -> tuple:
+    level = request.get("level", 0)
+    if not is_integer(level) or level < 0:
+        raise ValueError("'level' must be a non negative integer")
+    bird = request.get("bird", "red")
+    if not isinstance(bird, str) or bird not in BIRD_TYPES:
+        raise ValueError(f"unknown bird {bird!r}")
+    activate_at = request.get("activate_at")
+    if activate_at is not None and not is_integer(activate_at):
+        raise ValueError("'activate_at' must be an integer")
+    angle = request.get("angle")
+    impulse = request.get("impulse")
+    if not is_finite_number(angle) or not is_finite_number(impulse):
+        raise ValueError("'angle' and 'impulse' must be finite numbers")
+    return level, (bird, float(angle), float(impulse), activate_at)
+
+
+class ShotService:
+    def __init__(self, processes: int = None, batch_size: int = BATCH_SIZE, batch_window: float = BATCH_WINDOW):
+        self.processes = processes or os.cpu_count()
+        self.pool = ProcessPoolExecutor(self.processes)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue()
+        self.level_count = len(LevelPack())
+
+    async def evaluate(self, level: int, shot: tuple) -> dict:
+        if level >= self.level_count:
+            raise ValueError(f"there is no level {level}")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((level, shot, future))
+        return await future
+
+    async def run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.dispatch(batch)
+
+    def dispatch(self, batch: list):
+        """
+        Split a batch by level and in one chunk per worker, so the shots of a level
+        run on warm simulations in parallel. Each chunk answers as soon as it is done.
+        """
+        loop = asyncio.get_running_loop()
+        by_level = defaultdict(list)
+        for level, shot, future in batch:
+            by_level[level].append((shot, future))
+        for level, requests in by_level.items():
+            chunk = max(1, -(-len(requests) // self.processes))
+            for start in range(0, len(requests), chunk):
+                part = requests[start:start + chunk]
+                job = loop.run_in_executor(self.pool, _run_batch, level, [shot for shot, _ in part])
+                job.add_done_callback(partial(self.resolve, part))
+
+    @staticmethod
+    def resolve(part: list, job: asyncio.Future):
+        error = job.exception()
+        results = [None] * len(part) if error else job.result()
+        for (_, future), result in zip(part, results):
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def answer(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("expected an object")
+            request_id = request.get("id")
+            response = await self.evaluate(*parse_request(request))
+        except Exception as e:
+            response = {"error": str(e)}
+        response = {"id": request_id, **response}
+        writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # cada línea se atiende en su propia tarea, así los pedidos de una misma
+        # conexión también se agrupan y pueden responderse en otro orden, por su id
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self.answer(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str = None):
+        batches = asyncio.create_task(self.run_batches())
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batches.cancel()
+            self.pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="escuchar en un socket Unix en vez de TCP")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    async def run():
+        service = ShotService(args.processes, args.batch_size)
+        await service.serve(args.host, args.port, args.unix)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
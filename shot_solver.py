@@ -0,0 +1,155 @@
+"""
+Shot sweep solver. Simulates a grid of launch angles and impulses for one level and
+bird type on every core, then refines the grid around the best shots.
+
+    python shot_solver.py --level 1 --bird blue
+"""
+import argparse
+import math
+import multiprocessing
+import os
+from dataclasses import dataclass
+
+from game_logic import ImpulseVector
+from game_object import BIRD_TYPES
+from simulation import AIMING, Simulation
+
+MAX_STEPS = 900
+
+
+@dataclass
+class ShotResult:
+    angle: float
+    impulse: float
+    score: int
+    pigs_killed: int
+    settle_time: float
+    cleared: bool
+
+
+def is_settled(simulation: Simulation) -> bool:
+    """
+    The shot is over when the simulation is back to aiming, i.e. every pig, column and
+    bird in the level came to rest or only rolls on the floor harmlessly.
+    """
+    return simulation.state == AIMING
+
+
+def simulate_shot(simulation: Simulation, bird_type, angle: float, impulse: float,
+                  activate_at: int = None, max_steps: int = MAX_STEPS) -> ShotResult:
+    """
+    Reload the level, launch one bird and step until every body is at rest.
+    The angle is the launch direction in radians and the impulse is in the units of
+    ImpulseVector, before Bird applies max_impulse and power_multiplier.
+    """
+    simulation.setup_level()
+    pigs = simulation.remaining_pigs
+    simulation.launch(bird_type, ImpulseVector(angle, impulse))
+    steps = 0
+    while steps < max_steps:
+        simulation.step()
+        steps += 1
+        if steps == activate_at:
+            simulation.activate_bird()
+        if steps > 1 and is_settled(simulation):
+            break
+    return ShotResult(
+        angle,
+        impulse,
+        simulation.score,
+        pigs - simulation.remaining_pigs,
+        steps * simulation.time_step,
+        simulation.remaining_pigs == 0,
+    )
+
+
+# cada proceso del pool tiene su propia simulación y su propio espacio de pymunk
+_worker_simulation = None
+
+
+def _init_worker(level):
+    global _worker_simulation
+    _worker_simulation = Simulation(level)
+
+
+def _run_shot(args):
+    bird_type, angle, impulse, activate_at = args
+    return simulate_shot(_worker_simulation, bird_type, angle, impulse, activate_at)
+
+
+def rank(result: ShotResult):
+    return result.pigs_killed, result.score, -result.settle_time
+
+
+def solve(
+    level: int,
+    bird_type,
+    angle_range=(0.0, math.pi / 2),
+    impulse_range=(20.0, 100.0),
+    angles: int = 16,
+    impulses: int = 8,
+    rounds: int = 3,
+    top: int = 4,
+    activate_at: int = None,
+    processes: int = None,
+):
+    """
+    Sweep the grid and refine it `rounds - 1` times around the `top` best shots,
+    halving the spacing each round. Returns every simulated shot, best first.
+    """
+    # los tiros viven en una malla entera con la resolución de la última ronda,
+    # así un mismo punto alcanzado desde dos vecinos no se simula dos veces
+    scale = 2 ** (rounds - 1)
+    angle_cells = (angles - 1) * scale
+    impulse_cells = (impulses - 1) * scale
+
+    def to_shot(cell):
+        angle = angle_range[0] + (angle_range[1] - angle_range[0]) * cell[0] / max(angle_cells, 1)
+        impulse = impulse_range[0] + (impulse_range[1] - impulse_range[0]) * cell[1] / max(impulse_cells, 1)
+        return angle, impulse
+
+    cells = [(i * scale, j * scale) for i in range(angles) for j in range(impulses)]
+    results = {}
+    processes = processes or os.cpu_count() or 1
+    with multiprocessing.Pool(processes, _init_worker, (level,)) as pool:
+        for _ in range(rounds):
+            cells = [cell for cell in dict.fromkeys(cells) if cell not in results]
+            tasks = [(bird_type, *to_shot(cell), activate_at) for cell in cells]
+            chunksize = max(1, len(tasks) // (processes * 4))
+            for cell, result in zip(cells, pool.imap(_run_shot, tasks, chunksize)):
+                results[cell] = result
+
+            best = sorted(results, key=lambda cell: rank(results[cell]), reverse=True)[:top]
+            scale //= 2
+            cells = []
+            for i, j in best:
+                for di in (-scale, 0, scale):
+                    for dj in (-scale, 0, scale):
+                        cells.append((min(max(i + di, 0), angle_cells), min(max(j + dj, 0), impulse_cells)))
+    return sorted(results.values(), key=rank, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--level", type=int, default=0)
+    parser.add_argument("--bird", choices=sorted(BIRD_TYPES), default="red")
+    parser.add_argument("--angles", type=int, default=16)
+    parser.add_argument("--impulses", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--top", type=int, default=4)
+    parser.add_argument("--activate-at", type=int, default=None,
+                        help="step after launch at which the special action is triggered")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    results = solve(args.level, BIRD_TYPES[args.bird], angles=args.angles, impulses=args.impulses,
+                    rounds=args.rounds, top=args.top, activate_at=args.activate_at, processes=args.processes)
+    cleared = [result for result in results if result.cleared]
+    print(f"Nivel {args.level + 1}, pájaro {args.bird}: {len(results)} tiros, {len(cleared)} ganadores")
+    for result in results[:10]:
+        print(f"  ángulo {math.degrees(result.angle):6.1f}°  impulso {result.impulse:6.1f}  "
+              f"cerdos {result.pigs_killed}  puntaje {result.score:4d}  reposo {result.settle_time:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+import logging
+import platform
+import time
+
+import numpy as np
+import pymunk
+
+from game_logic import ImpulseVector
+from game_object import (
+    COLLISION_BIRD,
+    COLLISION_PIG,
+    COLLISION_STATIC,
+    COLLISION_STRUCTURE,
+    Bird,
+    BlueBird,
+    ExplosiveBird,
+    FragmentPool,
+    LevelManager,
+    EntityStore,
+    StaticObject,
+)
+from level_generator import use_broadphase
+from level_pack import LevelPack
+from lifecycle import LifecycleManager
+from snapshot import LevelSnapshot, read_checkpoint, write_checkpoint
+
+logger = logging.getLogger(__name__)
+
+WIDTH = 1800
+HEIGHT = 600
+GRAVITY = -900
+MAX_BIRDS = 3
+PHYSICS_RATE = 60
+SUBSTEPS = 1
+MAX_STEPS_PER_FRAME = 5
+SOLVER_THREADS = 1
+SOLVER_ITERATIONS = 10
+LAUNCH_POSITION = (200, 150)
+FLOOR_Y = 15
+# un contacto con más impulso que esto destruye lo que tenga puntos
+DESTROY_IMPULSE = 1200
+# estados del juego: se apunta, vuela un pájaro, la escena se asienta y se decide el
+# nivel. Solo cambian con eventos (lanzamiento, choque, salida del escenario, reposo)
+AIMING = "aiming"
+FLYING = "flying"
+SETTLING = "settling"
+LEVEL_COMPLETE = "level_complete"
+GAME_OVER = "game_over"
+# el reposo se revisa cada tantos pasos, y un nivel que no se asienta se decide igual
+SETTLE_CHECK_INTERVAL = 6
+MAX_SETTLE_STEPS = 600
+# solo estos contactos pueden sumar puntos, destruir algo o terminar un vuelo. Los
+# pájaros no se dañan entre ellos, así sus choques no llaman a Python. Los contactos en
+# reposo (una columna apoyada en el piso) salen del handler apenas leen el impulso
+COLLISION_PAIRS = (
+    (COLLISION_BIRD, COLLISION_PIG),
+    (COLLISION_BIRD, COLLISION_STRUCTURE),
+    (COLLISION_BIRD, COLLISION_STATIC),
+    (COLLISION_PIG, COLLISION_PIG),
+    (COLLISION_PIG, COLLISION_STRUCTURE),
+    (COLLISION_PIG, COLLISION_STATIC),
+    (COLLISION_STRUCTURE, COLLISION_STRUCTURE),
+    (COLLISION_STRUCTURE, COLLISION_STATIC),
+)
+
+
+class Simulation:
+    """
+    Headless game core. Owns the pymunk space, the level manager and the scoring and
+    win/loss rules. It never touches OpenGL or sprites, a renderer follows it through
+    the on_spawn, on_remove and on_level_loaded callbacks.
+    """
+    def __init__(
+        self,
+        level: int = 0,
+        physics_rate: float = PHYSICS_RATE,
+        substeps: int = SUBSTEPS,
+        max_steps_per_frame: int = MAX_STEPS_PER_FRAME,
+        pack: LevelPack = None,
+        broadphase: str = "bbtree",
+        threads: int = SOLVER_THREADS,
+        iterations: int = SOLVER_ITERATIONS,
+        prefetch: bool = False,
+        skip_idle: bool = True,
+    ):
+        # ajustes del espacio de pymunk, que se vuelve a crear en cada (re)inicio de nivel.
+        # El solver con hilos de pymunk no existe en Windows y admite como mucho 2 hilos,
+        # los callbacks se siguen llamando desde este hilo
+        self.threaded = threads > 1 and platform.system() != "Windows"
+        self.threads = threads
+        self.iterations = iterations
+        # "auto" usa un spatial hash en los niveles con muchos objetos parecidos
+        self.broadphase_mode = broadphase
+        self.broadphase = None
+        self.handlers = []
+        # prefetch construye el nivel siguiente en otro hilo mientras se juega este
+        self.level_manager = LevelManager(None, pack, prefetch)
+        self.level_manager.current_level = level
+        self.lifecycle = LifecycleManager(self, WIDTH)
+        # ancho del nivel actual, el piso y la pared derecha se crean con cada espacio
+        self.width = WIDTH
+        self.floor = None
+        self.right_wall = None
+        self.space = self.create_space()
+        self.level_manager.space = self.space
+
+        self.world = []
+        self.birds = []
+        self.entities = self.level_manager.entities
+        self.fragment_pool = FragmentPool(self.space)
+        self.fragment_pool.prefill(BlueBird, 2)
+        self.fragment_pool.prefill(ExplosiveBird, 7)
+
+        # callbacks para quien dibuje la simulación
+        self.on_spawn = None
+        self.on_remove = None
+        self.on_level_loaded = None
+        # al terminar un nivel, antes de cargar el siguiente o reiniciarlo
+        self.on_level_end = None
+        self.on_step = None
+        # se llaman con (obj, points) por cada objeto destruido, para efectos o estadísticas
+        self.destruction_listeners = []
+        # destrucciones pedidas durante el paso, se aplican juntas cuando termina
+        self.destroyed = {}
+        # antes del último paso de cada cuadro, para interpolar el dibujo
+        self.on_last_step = None
+        # se llama con (anterior, nuevo) en cada cambio de estado
+        self.on_state_change = None
+        # un FrameProfiler: cada paso marca el solver, el pájaro en vuelo y las reglas,
+        # y los collision handlers se miden aparte
+        self.profiler = None
+
+        self.state = SETTLING
+        # pasos desde el último cambio de estado
+        self.state_steps = 0
+        # apuntando con todo quieto: los pasos no mueven nada y se saltean
+        self.idle = False
+        self.skip_idle = skip_idle
+        # donde siguió la última búsqueda de un cuerpo despierto en world
+        self.rest_cursor = 0
+        self.bird_count = 0
+        self.active_bird = None
+        self.game_over = False
+        self.is_win = False
+        self.steps = 0
+        # pasos desde que se cargó el nivel, `steps` sigue contando entre niveles
+        self.level_steps = 0
+        self.collision_count = 0
+
+        # paso fijo: el tiempo real se acumula y se consume en pasos de time_step
+        self.time_step = 1 / physics_rate
+        self.substeps = substeps
+        self.max_steps_per_frame = max_steps_per_frame
+        self.accumulator = 0.0
+
+        # Niveles y puntaje
+        self.score = 0
+        self.total_score = 0
+        # estado inicial de cada nivel, para reiniciar sin volver a leer el nivel
+        self.snapshots = {}
+        self.setup_level()
+
+    @classmethod
+    def load_checkpoint(cls, path: str, **kwargs):
+        simulation = cls(**kwargs)
+        read_checkpoint(simulation, path)
+        return simulation
+
+    @property
+    def can_checkpoint(self) -> bool:
+        return self.state == AIMING and self.world_at_rest(False, rolling=False) and \
+            self.birds_at_rest(False, rolling=False)
+
+    def save_checkpoint(self, path: str):
+        """
+        Only while aiming with every body asleep. pymunk's cached contact impulses are
+        not saved, a level resumed in motion would drift away from the original run.
+        """
+        if not self.can_checkpoint:
+            raise ValueError("a checkpoint needs the simulation aiming with every body asleep")
+        write_checkpoint(self, path)
+
+    def collision_handler(self, arbiter, space, data):
+        profiler = self.profiler
+        if profiler is None or not profiler.recording:
+            return self.resolve_collision(arbiter)
+        start = time.perf_counter()
+        self.resolve_collision(arbiter)
+        profiler.nest("collisions", time.perf_counter() - start)
+        return True
+
+    def resolve_collision(self, arbiter):
+        self.collision_count += 1
+        impulse_norm = arbiter.total_impulse.length
+        if impulse_norm < 1000:
+            return True
+        logger.debug(impulse_norm)
+        entities = self.entities
+        if impulse_norm > DESTROY_IMPULSE:
+            for shape in arbiter.shapes:
+                entity = entities.entity(shape)
+                if entity is not None and entities.points[entity]:
+                    self.destroy(entity)
+        for shape in arbiter.shapes:
+            entity = entities.entity(shape)
+            if entity is not None and entities.kind[entity] == EntityStore.BIRD:
+                self.end_flight()
+                break
+
+        return True
+
+    def destroy(self, entity: int):
+        """
+        Queue an entity for destruction. The solver is still iterating the arbiters, so
+        the queue is applied in a post-step callback, once per entity however many
+        contacts hit it in the same step.
+        """
+        if entity in self.destroyed:
+            return
+        if not self.destroyed:
+            self.space.add_post_step_callback(self.apply_destroyed, self)
+        self.destroyed[entity] = self.entities.objects[entity]
+
+    def apply_destroyed(self, space, key):
+        destroyed = self.destroyed
+        self.destroyed = {}
+        self.remove_destroyed(destroyed)
+
+    def remove_destroyed(self, destroyed: dict, scored: bool = True):
+        """
+        Remove destroyed entities, given as {entity: object}, and count them as kills.
+        Without scored they are worth no points, like pigs that fell off the level.
+        """
+        entities = self.entities
+        ids = np.fromiter(destroyed, dtype=np.intp, count=len(destroyed))
+        points = entities.points[ids].tolist() if scored else [0] * len(ids)
+        self.score += sum(points)
+        self.remaining_pigs -= int(np.count_nonzero(entities.kind[ids] == EntityStore.PIG))
+        self.remove_many(destroyed.values())
+        for listener in self.destruction_listeners:
+            for obj, value in zip(destroyed.values(), points):
+                listener(obj, value)
+
+    def create_space(self) -> pymunk.Space:
+        space = pymunk.Space(threaded=self.threaded)
+        if self.threaded:
+            space.threads = self.threads
+            if space.threads != self.threads:
+                logger.debug(f"pymunk usa {space.threads} hilos, no {self.threads}")
+        space.iterations = self.iterations
+        space.gravity = (0, GRAVITY)
+        self.lifecycle.configure(space, self.width)
+        # pymunk solo puede pasar al spatial hash en un espacio recién creado
+        self.broadphase = use_broadphase(space, self.level_manager.level, self.broadphase_mode)
+        # un collision handler por cada par de categorías que importa
+        self.handlers = []
+        for type_a, type_b in COLLISION_PAIRS:
+            handler = space.add_collision_handler(type_a, type_b)
+            handler.post_solve = self.collision_handler
+            self.handlers.append(handler)
+        return space
+
+    def reset_space(self):
+        """
+        Start a new space with a floor and a right wall as wide as the current level.
+        pymunk keeps cached contacts, sleeping state and the insertion order of shapes
+        in a space, and the order decides how contacts are solved, so a level only plays
+        exactly like a freshly built one when it starts over in a fresh space.
+        """
+        old = self.space
+        old.remove(*old.shapes, *old.bodies)
+        self.width = self.level_manager.level.width or WIDTH
+        self.space = self.create_space()
+        self.floor = StaticObject((0, FLOOR_Y), (self.width, FLOOR_Y), self.space)
+        self.right_wall = StaticObject((self.width, 0), (self.width, HEIGHT), self.space)
+        self.level_manager.space = self.space
+        self.fragment_pool.space = self.space
+
+    def setup_level(self):
+        level = self.level_manager.current_level
+        snapshot = self.snapshots.get(level)
+        self.reset_space()
+        self.fragment_pool.release_all()
+        if snapshot:
+            self.remaining_pigs = snapshot.restore(self)
+        else:
+            self.remaining_pigs = self.level_manager.load_level(self.world, self.birds)
+            # solo se reinicia el nivel actual, los anteriores no vuelven
+            self.snapshots.clear()
+            self.snapshots[level] = LevelSnapshot.from_level(self.world, self.level_manager.level)
+            self.level_manager.prefetch()
+        self.bird_count = 0
+        self.score = 0
+        self.level_steps = 0
+        self.active_bird = None
+        # lo recién cargado puede estar cayendo, el nivel empieza asentándose
+        self.set_state(SETTLING)
+        if self.on_level_loaded:
+            self.on_level_loaded()
+
+    def add_bird(self, bird: Bird):
+        self.birds.append(bird)
+        self.entities.add(bird)
+        if self.on_spawn:
+            self.on_spawn(bird)
+
+    def spawn_fragment(self, bird_type, position, velocity):
+        if self.fragment_pool.is_full():
+            self.remove(self.fragment_pool.live[0])
+        self.add_bird(self.fragment_pool.acquire(bird_type, position, velocity))
+
+    def remove(self, obj):
+        self.remove_many([obj])
+
+    def remove_many(self, objs):
+        """
+        Take several objects out of the level with a single space.remove call.
+        """
+        objs = list(dict.fromkeys(objs))
+        removed = set(objs)
+        self.world[:] = [obj for obj in self.world if obj not in removed]
+        self.birds[:] = [bird for bird in self.birds if bird not in removed]
+        items = []
+        for obj in objs:
+            self.entities.remove(obj)
+            items.append(obj.shape)
+            items.append(obj.body)
+        self.space.remove(*items)
+        for obj in objs:
+            if getattr(obj, "is_fragment", False):
+                self.fragment_pool.release(obj)
+            if obj is self.active_bird:
+                self.end_flight()
+            if self.on_remove:
+                self.on_remove(obj)
+
+    def launch(self, bird_type, impulse_vector: ImpulseVector, x: float = LAUNCH_POSITION[0],
+               y: float = LAUNCH_POSITION[1]):
+        """
+        Launch a bird of the given class. Returns None while another bird is still flying.
+        """
+        if self.bird_flying:
+            logger.debug("¡No puedes lanzar más pájaros!")
+            return None
+        self.bird_count += 1
+        bird = bird_type(impulse_vector, x, y, self.space)
+        self.add_bird(bird)
+        self.start_flight(bird)
+        return bird
+
+    @property
+    def bird_flying(self) -> bool:
+        return self.state == FLYING
+
+    def set_state(self, state: str):
+        previous = self.state
+        self.state = state
+        self.state_steps = 0
+        self.idle = False
+        if self.on_state_change and state != previous:
+            self.on_state_change(previous, state)
+
+    def start_flight(self, bird: Bird):
+        self.active_bird = bird
+        self.set_state(FLYING)
+
+    def end_flight(self):
+        """
+        The bird in flight hit something, left the level or stopped: wait for the scene
+        to settle before deciding the level.
+        """
+        self.active_bird = None
+        if self.state == FLYING:
+            self.set_state(SETTLING)
+
+    def activate_bird(self):
+        """
+        Trigger the special action of the bird in flight (boost, split, explode, growth).
+        """
+        if self.bird_flying and self.active_bird:
+            self.active_bird.activate(self)
+
+    def advance(self, delta_time: float) -> float:
+        """
+        Consume delta_time in fixed physics steps, at most max_steps_per_frame of them.
+        Returns the interpolation factor between the last two physics states.
+        """
+        self.accumulator += delta_time
+        n = int(self.accumulator / self.time_step)
+        if n > self.max_steps_per_frame:
+            # evitar la espiral de la muerte: el tiempo que no alcanza se descarta
+            n = self.max_steps_per_frame
+            self.accumulator = n * self.time_step
+        if n > 0:
+            self.step(n - 1)
+            if self.on_last_step:
+                self.on_last_step()
+            self.step(1)
+            self.accumulator -= n * self.time_step
+        return self.accumulator / self.time_step
+
+    def step(self, n: int = 1):
+        dt = self.time_step / self.substeps
+        profiler = self.profiler
+        for _ in range(n):
+            if self.game_over or self.is_win:
+                return
+            if self.idle:
+                # nada se mueve hasta el próximo lanzamiento, solo avanza el reloj
+                self.steps += 1
+                if self.on_step:
+                    self.on_step()
+                continue
+            for _ in range(self.substeps):
+                self.space.step(dt)
+            if profiler:
+                profiler.mark("space")
+            self.steps += 1
+            self.level_steps += 1
+            self.state_steps += 1
+            if self.state == FLYING:
+                self.check_active_bird()
+                if profiler:
+                    profiler.mark("active_bird")
+            self.lifecycle.after_step()
+            if self.state_steps % SETTLE_CHECK_INTERVAL == 0:
+                self.check_settled()
+            if profiler:
+                profiler.mark("rules")
+            if self.on_step:
+                self.on_step()
+
+    def check_active_bird(self):
+        # pymunk no avisa cuando un cuerpo sale de una zona o se frena, así que el único
+        # cuerpo en vuelo se mira en cada paso; el costo no depende del tamaño del nivel
+        bird = self.active_bird
+        if bird is None:
+            self.end_flight()
+            return
+        position = bird.body.position
+        if position.y < 10 or position.x < 0 or position.x > self.width or position.y > HEIGHT or \
+                bird.body.velocity.length < 10:
+            self.end_flight()
+
+    def world_at_rest(self, ignore_out_of_bounds: bool = True, rolling: bool = True) -> bool:
+        """
+        True when every pig and column sleeps, or with rolling only rolls harmlessly on
+        the floor. pymunk puts a body to sleep once it and everything it touches kept
+        still, rotation included, for sleep_time_threshold.
+        The search resumes at the body found awake last time, which is usually still
+        awake, so a check costs O(1) while the scene moves and one pass once it stops.
+        """
+        world = self.world
+        n = len(world)
+        start = self.rest_cursor if self.rest_cursor < n else 0
+        for k in range(n):
+            i = start + k
+            if i >= n:
+                i -= n
+            obj = world[i]
+            if obj.body.is_sleeping:
+                continue
+            # el piso termina a la izquierda, un chancho que rueda hacia allá todavía
+            # puede caerse del nivel
+            if rolling and obj.body.velocity.x >= 0 and self.rolls_harmlessly(obj):
+                continue
+            # lo que cayó fuera del escenario ya no puede afectar el resultado
+            if ignore_out_of_bounds and self.lifecycle.is_out_of_bounds(obj):
+                continue
+            self.rest_cursor = i
+            return False
+        return True
+
+    def rolls_harmlessly(self, obj) -> bool:
+        """
+        A circle on the floor without the momentum to break anything. pymunk circles
+        have no rolling resistance and may roll for a long time, but they cannot fall
+        any more and whatever they reach takes less than DESTROY_IMPULSE.
+        """
+        shape = obj.shape
+        body = obj.body
+        if not isinstance(shape, pymunk.Circle) or body.position.y - shape.radius > FLOOR_Y + 1:
+            return False
+        return 2 * body.mass * body.velocity.length < DESTROY_IMPULSE
+
+    def birds_at_rest(self, ignore_out_of_bounds: bool = True, rolling: bool = True) -> bool:
+        """
+        True when every bird sleeps or, with rolling, only rolls harmlessly.
+        """
+        # el ciclo de vida limita la cantidad de pájaros, esta pasada está acotada
+        for bird in self.birds:
+            if bird.body.is_sleeping or rolling and self.rolls_harmlessly(bird):
+                continue
+            if ignore_out_of_bounds and self.lifecycle.is_out_of_bounds(bird):
+                continue
+            return False
+        return True
+
+    def check_settled(self):
+        """
+        While settling, decide the turn once the pigs, columns and birds in the level
+        sleep or roll harmlessly, a bird still bouncing can reach a pig. While aiming,
+        stop stepping once everything sleeps, out of bounds bodies are left to the
+        lifecycle sweep first.
+        """
+        if self.state == SETTLING:
+            if self.state_steps >= MAX_SETTLE_STEPS or self.world_at_rest() and self.birds_at_rest():
+                # lo que cayó del nivel y el barrido todavía no sacó se cuenta antes de decidir
+                self.lifecycle.sweep()
+                self.check_level_state()
+        elif self.state == AIMING and self.skip_idle:
+            self.idle = self.world_at_rest(ignore_out_of_bounds=False, rolling=False) and \
+                self.birds_at_rest(ignore_out_of_bounds=False, rolling=False)
+
+    def check_level_state(self):
+        if self.bird_count < MAX_BIRDS:
+            self.set_state(AIMING)
+        elif self.remaining_pigs > 0:
+            self.game_over = True
+            self.total_score += self.score
+            logger.debug(f"¡Perdiste! Puntaje acumulado: {self.total_score}")
+            self.end_level()
+            self.set_state(GAME_OVER)
+        elif self.score < self.level_manager.level.min_score:
+            self.game_over = True
+            self.total_score += self.score
+            logger.debug(f"¡Puntaje insuficiente! Puntaje acumulado: {self.total_score}")
+            self.end_level()
+            self.set_state(GAME_OVER)
+        elif self.level_manager.next_level():
+            self.total_score += self.score
+            self.set_state(LEVEL_COMPLETE)
+            self.end_level()
+        else:
+            logger.debug("¡Juego completado!")
+            logger.debug(f"Puntaje acumulado: {self.total_score}")
+            self.is_win = True
+            self.end_level()
+            self.set_state(LEVEL_COMPLETE)
+
+    def end_level(self):
+        if self.on_level_end:
+            self.on_level_end()
+        self.setup_level()
@@ -0,0 +1,150 @@
+"""
+Level snapshots. The initial state of a level is captured once after it is built and
+restarts restore it into a fresh space, reusing the same game objects. A running
+level can also be written to a compact binary checkpoint and resumed later.
+
+Checkpoints are taken while aiming with every body asleep. The resumed level has the
+same bodies, states, counters and birds, but pymunk's cached contact impulses are not
+saved, so the following shots are close to the original run without matching it to
+the last pixel.
+"""
+import json
+import struct
+
+from game_logic import ImpulseVector
+from game_object import BIRD_TYPES, EntityStore, renew_body
+
+CHECKPOINT_MAGIC = b"ABSNAP1\n"
+BODY_STATE = struct.Struct("<6d")
+BIRD_FLAGS = ("has_boosted", "has_split", "has_exploded", "has_growth")
+BIRD_NAMES = {bird_type: name for name, bird_type in BIRD_TYPES.items()}
+
+
+def get_body_state(body) -> tuple:
+    return (body.position.x, body.position.y, body.angle,
+            body.velocity.x, body.velocity.y, body.angular_velocity)
+
+
+def set_body_state(body, state):
+    x, y, angle, vx, vy, angular_velocity = state
+    body.position = (x, y)
+    body.angle = angle
+    body.velocity = (vx, vy)
+    body.angular_velocity = angular_velocity
+    body.force = (0, 0)
+    body.torque = 0
+
+
+class LevelSnapshot:
+    """
+    Objects of a freshly loaded level together with the state of their bodies.
+    """
+    def __init__(self, objects, states):
+        self.objects = objects
+        self.states = states
+        self.positions = {obj: i for i, obj in enumerate(objects)}
+
+    @classmethod
+    def from_level(cls, objects, level):
+        """
+        Snapshot of a level that was just built, one object per level item in order.
+        The initial state is the level data itself, no body has to be read.
+        """
+        return cls(list(objects), [(item.x, item.y, item.angle, 0, 0, 0) for item in level.objects])
+
+    def restore(self, simulation):
+        """
+        Put the objects back into the simulation's new, empty space in the order and
+        state they had when the level was built, with new bodies so nothing from the
+        last attempt is left in the solver.
+        """
+        simulation.birds.clear()
+        simulation.world[:] = self.objects
+        simulation.entities.clear()
+        for obj, state in zip(self.objects, self.states):
+            renew_body(obj)
+            set_body_state(obj.body, state)
+        simulation.space.add(*[item for obj in self.objects for item in (obj.body, obj.shape)])
+        for obj in self.objects:
+            simulation.entities.add(obj)
+        return simulation.entities.count(EntityStore.PIG)
+
+
+def write_checkpoint(simulation, path: str):
+    """
+    Write the running level: counters and flags as a JSON header, then one packed
+    block of body states for the surviving level objects followed by the birds.
+    """
+    snapshot = simulation.snapshots[simulation.level_manager.current_level]
+    world = [snapshot.positions[obj] for obj in simulation.world]
+    birds = []
+    for bird in simulation.birds:
+        flags = [flag for flag in BIRD_FLAGS if getattr(bird, flag, False)]
+        birds.append([BIRD_NAMES[type(bird)], bird.is_fragment, flags])
+    active = simulation.birds.index(simulation.active_bird) if simulation.active_bird in simulation.birds else None
+    header = json.dumps({
+        "level": simulation.level_manager.current_level,
+        "steps": simulation.steps,
+        "level_steps": simulation.level_steps,
+        "score": simulation.score,
+        "total_score": simulation.total_score,
+        "bird_count": simulation.bird_count,
+        "remaining_pigs": simulation.remaining_pigs,
+        "state": simulation.state,
+        "bird_flying": simulation.bird_flying,
+        "active_bird": active,
+        "world": world,
+        "birds": birds,
+    }, separators=(",", ":")).encode()
+    with open(path, "wb") as f:
+        f.write(CHECKPOINT_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for obj in simulation.world + simulation.birds:
+            f.write(BODY_STATE.pack(*get_body_state(obj.body)))
+
+
+def read_checkpoint(simulation, path: str):
+    """
+    Apply a checkpoint to a simulation, loading the checkpoint's level first.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+            raise ValueError(f"{path} is not a level checkpoint")
+        (size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(size))
+        states = [state for state in BODY_STATE.iter_unpack(f.read())]
+
+    simulation.level_manager.current_level = header["level"]
+    simulation.setup_level()
+    snapshot = simulation.snapshots[header["level"]]
+    alive = [snapshot.objects[i] for i in header["world"]]
+    kept = set(alive)
+    simulation.remove_many([obj for obj in snapshot.objects if obj not in kept])
+
+    for obj, state in zip(alive, states):
+        set_body_state(obj.body, state)
+    for (name, is_fragment, flags), state in zip(header["birds"], states[len(alive):]):
+        bird_type = BIRD_TYPES[name]
+        if is_fragment:
+            bird = simulation.fragment_pool.acquire(bird_type, (state[0], state[1]), (state[3], state[4]))
+        else:
+            bird = bird_type(ImpulseVector(0, 0), state[0], state[1], simulation.space)
+            if "has_growth" in flags:
+                bird.growth()
+        for flag in flags:
+            setattr(bird, flag, True)
+        set_body_state(bird.body, state)
+        simulation.add_bird(bird)
+
+    for key in ("steps", "score", "total_score", "bird_count", "remaining_pigs"):
+        setattr(simulation, key, header[key])
+    simulation.level_steps = header.get("level_steps", simulation.steps)
+    if header["active_bird"] is not None:
+        simulation.active_bird = simulation.birds[header["active_bird"]]
+    if header["bird_flying"]:
+        simulation.start_flight(simulation.active_bird)
+    elif "state" in header:
+        simulation.set_state(header["state"])
+    if simulation.on_level_loaded:
+        simulation.on_level_loaded()
@@ -0,0 +1,163 @@
+import arcade
+import numpy as np
+
+from asset_manifest import AssetManifest
+from game_object import Bird, BlueBird, Column, ExplosiveBird, GrowingBird, Pig, YellowBird
+
+# tipo de cada objeto del juego en el manifiesto de recursos
+SPRITE_KINDS = {
+    Bird: "red",
+    YellowBird: "yellow",
+    BlueBird: "blue",
+    ExplosiveBird: "explosive",
+    GrowingBird: "growing",
+    Pig: "pig",
+    Column: "column",
+}
+
+
+class EntitySprite(arcade.Sprite):
+    """
+    Sprite that draws a headless game object. It owns no physics, it only copies
+    the position and angle of the object's pymunk body. The texture is shared with
+    every other sprite of the same kind.
+    """
+    def __init__(self, obj, assets: AssetManifest):
+        kind = SPRITE_KINDS[type(obj)]
+        scale = assets.scale(kind)
+        super().__init__(scale=scale, texture=assets.texture(kind))
+        self.obj = obj
+        self.base_scale = scale
+        self.update()
+
+    def update(self):
+        body = self.obj.body
+        self.position = body.position
+        self.radians = body.angle
+        scale = self.base_scale * getattr(self.obj, "scale", 1)
+        if self.scale != scale:
+            self.scale = scale
+
+
+class SpriteSync:
+    """
+    Batched body-to-sprite synchronization. Every frame the transforms of all bound
+    objects are read into one array, interpolated between the previous and the current
+    physics state in a single NumPy pass, and only the sprites whose transform changed
+    are touched. Sleeping bodies do not move: a body that was already asleep at the
+    last read is not read again, and its sprite is not touched.
+
+    Reading a pymunk body costs about as much as writing a sprite, so the transforms
+    read at the end of a frame are kept and reused when the next frame starts from the
+    same physics step, `steps` is the simulation's step counter.
+    """
+    TOLERANCE = 0.01
+
+    def __init__(self):
+        self.objects = []
+        self.sprites = []
+        self.index = {}
+        # arreglos con capacidad de sobra, las filas válidas son [:len(self.objects)]
+        self.previous = np.empty((64, 3))
+        self.pushed = np.empty((64, 3))
+        self.latest = np.empty((64, 3))
+        # cuerpos que ya dormían en la última lectura, su fila de latest sigue valiendo
+        self.asleep = np.zeros(64, dtype=bool)
+        self.latest_steps = None
+        # objetos que pueden cambiar de tamaño (GrowingBird)
+        self.scaled = []
+
+    def __len__(self):
+        return len(self.objects)
+
+    def add(self, obj, sprite: EntitySprite):
+        i = len(self.objects)
+        if i == len(self.pushed):
+            self.previous = np.resize(self.previous, (2 * i, 3))
+            self.pushed = np.resize(self.pushed, (2 * i, 3))
+            self.latest = np.resize(self.latest, (2 * i, 3))
+            self.asleep = np.resize(self.asleep, 2 * i)
+        self.index[obj] = i
+        self.objects.append(obj)
+        self.sprites.append(sprite)
+        self.previous[i] = self.pushed[i] = self.latest[i] = self.read([obj])[0]
+        self.asleep[i] = False
+        if hasattr(obj, "scale"):
+            self.scaled.append(sprite)
+
+    def remove(self, obj):
+        i = self.index.pop(obj)
+        last = len(self.objects) - 1
+        if i != last:
+            # se mueve el último al hueco para no desplazar los arreglos
+            moved = self.objects[last]
+            self.objects[i] = moved
+            self.sprites[i], self.sprites[last] = self.sprites[last], self.sprites[i]
+            self.previous[i] = self.previous[last]
+            self.pushed[i] = self.pushed[last]
+            self.latest[i] = self.latest[last]
+            self.asleep[i] = self.asleep[last]
+            self.index[moved] = i
+        self.objects.pop()
+        sprite = self.sprites.pop()
+        if sprite in self.scaled:
+            self.scaled.remove(sprite)
+
+    def clear(self):
+        self.objects.clear()
+        self.sprites.clear()
+        self.index.clear()
+        self.scaled.clear()
+        self.latest_steps = None
+
+    @staticmethod
+    def read(objects) -> np.ndarray:
+        transforms = [(*body.position, body.angle) for body in [obj.body for obj in objects]]
+        return np.array(transforms, dtype=float).reshape(len(objects), 3)
+
+    def refresh(self, steps: int):
+        """
+        Read the transforms of the physics step `steps` into `latest`, once per step.
+        Asking a body whether it sleeps is much cheaper than reading its transform.
+        """
+        if steps == self.latest_steps:
+            return
+        self.latest_steps = steps
+        objects = self.objects
+        n = len(objects)
+        asleep = np.fromiter((obj.body.is_sleeping for obj in objects), dtype=bool, count=n)
+        stale = np.flatnonzero(~(asleep & self.asleep[:n])).tolist()
+        self.asleep[:n] = asleep
+        if stale:
+            self.latest[stale] = self.read([objects[i] for i in stale])
+
+    def capture_previous(self, steps: int):
+        """
+        Remember the current transforms, called right before the last physics step of a frame.
+        """
+        self.refresh(steps)
+        n = len(self.objects)
+        self.previous[:n] = self.latest[:n]
+
+    def sync(self, steps: int, alpha: float = 1.0) -> int:
+        """
+        Push the interpolated transforms to the sprites, returns how many sprites moved.
+        """
+        self.refresh(steps)
+        n = len(self.objects)
+        current = self.latest[:n]
+        if alpha < 1.0:
+            current = self.previous[:n] + (current - self.previous[:n]) * alpha
+        pushed = self.pushed[:n]
+        changed = np.flatnonzero(np.abs(current - pushed).max(axis=1, initial=0) > self.TOLERANCE)
+        sprites = self.sprites
+        for i, (x, y, angle) in zip(changed.tolist(), current[changed].tolist()):
+            sprite = sprites[i]
+            sprite.position = (x, y)
+            sprite.radians = angle
+        pushed[changed] = current[changed]
+        for sprite in self.scaled:
+            scale = sprite.base_scale * sprite.obj.scale
+            if sprite.scale != scale:
+                sprite.scale = scale
+        return len(changed)
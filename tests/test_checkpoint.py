@@ -0,0 +1,50 @@
+"""
+A checkpoint taken while aiming resumes the same level: the same bodies in the same
+state, the same counters and the same birds left on the field.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from game_logic import ImpulseVector
+from game_object import BIRD_TYPES
+from simulation import Simulation
+from snapshot import get_body_state
+
+COUNTERS = ("level_steps", "score", "total_score", "bird_count", "remaining_pigs", "state")
+
+
+def shoot(simulation, bird, angle, impulse):
+    simulation.launch(BIRD_TYPES[bird], ImpulseVector(angle, impulse))
+    simulation.step(20)
+    simulation.activate_bird()
+    while not simulation.can_checkpoint:
+        simulation.step()
+
+
+def state(simulation):
+    return ([get_body_state(obj.body) for obj in simulation.world],
+            [(type(bird), bird.is_fragment, get_body_state(bird.body)) for bird in simulation.birds],
+            [getattr(simulation, key) for key in COUNTERS])
+
+
+@pytest.mark.parametrize("level, bird", [(0, "explosive"), (1, "blue"), (3, "red")])
+def test_checkpoint_round_trip(tmp_path, level, bird):
+    path = str(tmp_path / "checkpoint.snap")
+    simulation = Simulation(level)
+    shoot(simulation, bird, 0.35, 60)
+    simulation.save_checkpoint(path)
+    resumed = Simulation.load_checkpoint(path)
+    assert resumed.level_manager.current_level == level
+    assert state(resumed) == state(simulation)
+
+
+def test_no_checkpoint_in_flight(tmp_path):
+    simulation = Simulation(0)
+    simulation.launch(BIRD_TYPES["red"], ImpulseVector(0.35, 60))
+    simulation.step(2)
+    with pytest.raises(ValueError):
+        simulation.save_checkpoint(str(tmp_path / "checkpoint.snap"))
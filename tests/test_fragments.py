@@ -0,0 +1,49 @@
+"""
+Fragments and spent birds must be recycled: the number of bodies in the space stays
+bounded however many birds split or explode, through the normal game rules.
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic import ImpulseVector
+from game_object import BlueBird, ExplosiveBird
+from simulation import Simulation
+
+SHOTS = 40
+ACTIVATE_AT = 5
+MAX_SHOT_STEPS = 900
+
+
+def test_bodies_stay_bounded():
+    simulation = Simulation()
+    world_size = len(simulation.world)
+    # piso, pared, objetos del nivel, pájaros gastados que guarda el ciclo de vida,
+    # el pájaro en vuelo y como mucho un pool lleno de fragmentos
+    limit = 2 + world_size + simulation.lifecycle.max_spent_birds + 1 + simulation.fragment_pool.size
+    resets = 0
+    fragments = []
+    simulation.on_spawn = lambda obj: obj.is_fragment and fragments.append(obj)
+    for shot in range(SHOTS):
+        if simulation.game_over or simulation.is_win:
+            # reiniciar el nivel igual que un jugador después de perder
+            simulation.game_over = False
+            simulation.is_win = False
+            simulation.level_manager.current_level = 0
+            simulation.setup_level()
+            resets += 1
+        bird_type = ExplosiveBird if shot % 2 else BlueBird
+        assert simulation.launch(bird_type, ImpulseVector(math.pi + 0.6, -60)) is not None
+        for step in range(1, MAX_SHOT_STEPS + 1):
+            simulation.step()
+            if step == ACTIVATE_AT:
+                simulation.activate_bird()
+            assert len(simulation.space.bodies) <= limit
+            if simulation.state == "aiming" or simulation.game_over or simulation.is_win:
+                break
+    # el juego siguió sus reglas, cada tres pájaros se termina el nivel, y salieron
+    # más fragmentos de los que entran en el pool
+    assert resets > 0
+    assert len(fragments) > 2 * simulation.fragment_pool.size
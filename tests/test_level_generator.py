@@ -0,0 +1,34 @@
+"""
+A generated level must stand still on its own: with no bird launched nothing breaks
+and nothing scores, however many objects it has.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from level_generator import LAYOUTS, generate_level
+from simulation import HEIGHT, Simulation
+
+IDLE_STEPS = 300
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("count", [40, 1000])
+def test_generated_level_stands_still(layout, count):
+    level = generate_level(layout, count)
+    assert len(level.objects) == count
+    assert max(obj.y for obj in level.objects) < HEIGHT
+    simulation = Simulation(0, pack=[level], skip_idle=False)
+    for _ in range(IDLE_STEPS):
+        simulation.step()
+    assert len(simulation.world) == count
+    assert simulation.score == 0
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_pigs_grow_with_the_level(layout):
+    pigs = [sum(obj.type == "pig" for obj in generate_level(layout, count).objects) for count in (300, 3000)]
+    assert pigs[1] > 5 * pigs[0]
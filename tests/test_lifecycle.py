@@ -0,0 +1,22 @@
+"""
+A pig that falls off the level is gone for good: the sweep removes it and the level
+counts it as killed, without points, so the level can still be won.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_object import PIG_RADIUS, EntityStore
+from level_pack import Level, LevelObject
+from simulation import FLOOR_Y, Simulation
+
+
+def test_swept_pig_counts_as_killed():
+    level = Level("sweep", [LevelObject("pig", -40, FLOOR_Y + PIG_RADIUS, material="pig"),
+                            LevelObject("pig", 900, FLOOR_Y + PIG_RADIUS, material="pig")])
+    simulation = Simulation(0, pack=[level], skip_idle=False)
+    simulation.step(120)
+    assert len(simulation.world) == 1
+    assert simulation.remaining_pigs == simulation.entities.count(EntityStore.PIG) == 1
+    assert simulation.score == 0
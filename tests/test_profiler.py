@@ -0,0 +1,46 @@
+"""
+The profiler splits a frame of the simulation into the solver, the collision
+handlers, the active bird check and the game rules.
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic import ImpulseVector
+from game_object import BlueBird
+from profiler import FrameProfiler, phase_totals
+from simulation import Simulation
+
+
+def test_simulation_phases():
+    simulation = Simulation()
+    profiler = FrameProfiler()
+    profiler.enabled = True
+    simulation.profiler = profiler
+    simulation.launch(BlueBird, ImpulseVector(math.pi + 0.6, -60))
+    collisions = simulation.collision_count
+    for _ in range(120):
+        profiler.begin_frame()
+        simulation.advance(simulation.time_step)
+        profiler.end_frame()
+    assert simulation.collision_count > collisions
+    totals = {}
+    for _, phases, counters in profiler.frames:
+        assert all(duration >= 0 for _, _, duration in phases)
+        assert math.isclose(sum(phase_totals(phases).values()), counters["frame"])
+        for phase in phase_totals(phases):
+            totals[phase] = totals.get(phase, 0) + 1
+    assert {"space", "collisions", "active_bird", "rules"} <= set(totals)
+    assert totals["space"] == totals["rules"] == 120
+
+
+def test_disabled_profiler_records_nothing():
+    simulation = Simulation()
+    profiler = FrameProfiler()
+    simulation.profiler = profiler
+    profiler.begin_frame()
+    simulation.advance(simulation.time_step * 3)
+    profiler.end_frame()
+    assert not profiler.frames
@@ -0,0 +1,41 @@
+"""
+A turn is decided once the scene is at rest: stepping on after a shot settled must
+not break anything else or change the score.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_object import BIRD_TYPES
+from shot_solver import simulate_shot
+from simulation import MAX_SETTLE_STEPS, Simulation
+
+EXTRA_STEPS = 600
+
+
+def random_shots(count, seed=1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (rng.randrange(4), rng.choice(list(BIRD_TYPES)), rng.uniform(0, 1), rng.uniform(20, 90),
+               rng.choice([None, 10, 20, 30]))
+
+
+def test_nothing_changes_after_settling():
+    simulations = {}
+    shots = [(0, "explosive", 0.13, 64.1, None)] + list(random_shots(100))
+    decided = 0
+    for level, bird, angle, impulse, activate_at in shots:
+        simulation = simulations.setdefault(level, Simulation(level, skip_idle=False))
+        result = simulate_shot(simulation, BIRD_TYPES[bird], angle, impulse, activate_at)
+        # un nivel que no se asentó a tiempo se decide igual, ahí sí puede seguir cambiando
+        if result.settle_time >= MAX_SETTLE_STEPS * simulation.time_step:
+            continue
+        decided += 1
+        settled = (simulation.score, simulation.remaining_pigs, len(simulation.world))
+        for _ in range(EXTRA_STEPS):
+            simulation.step()
+        assert (simulation.score, simulation.remaining_pigs, len(simulation.world)) == settled, \
+            (level, bird, angle, impulse, activate_at)
+    assert decided > 0.9 * len(shots)
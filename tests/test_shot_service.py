@@ -0,0 +1,52 @@
+"""
+A worker of the shot service answers from warm simulations, so a request must get the
+same answer whichever worker runs it and whatever that worker ran before. Requests
+that could not be simulated are refused up front.
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import shot_service
+from shot_service import _run_batch, parse_request
+
+SHOTS = [(bird, angle, 60, 20) for bird in ("red", "blue", "explosive") for angle in (0.2, 0.35, 0.471)]
+
+
+def fresh_answer(level, shot):
+    shot_service._worker_simulations.clear()
+    return _run_batch(level, [shot])[0]
+
+
+def test_warm_worker_matches_fresh_worker():
+    for level in (0, 3):
+        expected = [fresh_answer(level, shot) for shot in SHOTS]
+        shot_service._worker_simulations.clear()
+        assert _run_batch(level, SHOTS) == expected
+        # el mismo trabajador, ya usado, en otro orden
+        assert _run_batch(level, SHOTS[::-1]) == expected[::-1]
+
+
+def test_parse_request():
+    assert parse_request({"level": 1, "bird": "blue", "angle": 0.35, "impulse": 60, "activate_at": 20}) == \
+        (1, ("blue", 0.35, 60.0, 20))
+
+
+@pytest.mark.parametrize("request_", [
+    {"level": True, "angle": 0.35, "impulse": 60},
+    {"level": 1.0, "angle": 0.35, "impulse": 60},
+    {"angle": math.nan, "impulse": 60},
+    {"angle": 0.35, "impulse": math.inf},
+    {"angle": "0.35", "impulse": 60},
+    {"angle": False, "impulse": 60},
+    {"impulse": 60},
+    {"angle": 0.35, "impulse": 60, "activate_at": True},
+    {"angle": 0.35, "impulse": 60, "bird": ["red"]},
+])
+def test_parse_request_rejects(request_):
+    with pytest.raises(ValueError):
+        parse_request(request_)
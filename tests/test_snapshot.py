@@ -0,0 +1,31 @@
+"""
+Restarting a level from its snapshot must play exactly like building it again: the
+same shot on a reused simulation and on a new one ends with the same bodies.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from game_object import BIRD_TYPES
+from shot_solver import simulate_shot
+from snapshot import get_body_state
+from simulation import Simulation
+
+SHOTS = [(angle, impulse) for angle in (0.2, 0.35, 0.471, 0.6) for impulse in (40, 60)]
+ACTIVATE_AT = 20
+
+
+def shoot(simulation, bird, angle, impulse):
+    result = simulate_shot(simulation, BIRD_TYPES[bird], angle, impulse, ACTIVATE_AT)
+    return result, [get_body_state(obj.body) for obj in simulation.world + simulation.birds]
+
+
+@pytest.mark.parametrize("level", [0, 3])
+def test_warm_shot_equals_fresh_shot(level):
+    warm = Simulation(level)
+    for bird in BIRD_TYPES:
+        for angle, impulse in SHOTS:
+            assert shoot(warm, bird, angle, impulse) == shoot(Simulation(level), bird, angle, impulse)
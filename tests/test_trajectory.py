@@ -0,0 +1,32 @@
+"""
+The aiming preview follows the bird the controller launches, step by step until its
+first contact, however many sub-steps the simulation takes per step.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from controller import PREVIEW_STRIDE, Controller
+from simulation import Simulation
+
+FREE_FLIGHT_POINTS = 8
+
+
+@pytest.mark.parametrize("substeps", [1, 4])
+def test_preview_matches_flight(substeps):
+    simulation = Simulation(0, substeps=substeps)
+    controller = Controller(simulation)
+    controller.press(300, 300)
+    controller.drag(200, 260)
+    preview = controller.trajectory()[:FREE_FLIGHT_POINTS]
+    controller.release(200, 260)
+    flight = []
+    for _ in range(FREE_FLIGHT_POINTS):
+        simulation.step(PREVIEW_STRIDE)
+        flight.append(tuple(simulation.active_bird.body.position))
+    assert len(preview) == FREE_FLIGHT_POINTS
+    assert np.allclose(preview, flight, atol=1e-6)